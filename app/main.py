@@ -2,69 +2,109 @@
 
 import logging
 import asyncio
+import multiprocessing
+import signal
 
+from aiohttp import web
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
-from fluent_compiler.bundle import FluentBundle
-from fluentogram import TranslatorHub, FluentTranslator
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
 
 from app.src.utils.config import settings
 from app.src.handlers import router as main_router
-from app.src.database.engine import start_db
+from app.src.database.engine import start_db, stop_db
+from app.src.database.requests import (
+    flush_request_counts,
+    prune_match_archive,
+    run_request_counts_flusher,
+)
+from app.src.parsers.http_client import start_http_session, close_http_session
+from app.src.parsers.heroes import load_heroes_snapshot, run_heroes_refresher
+from app.src.utils.broadcast import resume_unfinished_broadcast, stop_broadcasts
+from app.src.utils.storage import close_redis, create_fsm_storage
+from app.src.utils.throttling import create_throttle_backend
+from app.src.utils.translations import create_translator_hub
+from app.src.utils.keyboards import prebuild_keyboards
 from app.src.utils.middlewares import (
+    DeadlineMiddleware,
     TranslateMiddleware,
     ThrottlingMiddleware,
     UserMiddleware,
 )
 
 
-t_hub = TranslatorHub(
-    {"ru": ("ru",), "en": ("en", "ru")},
-    translators=[
-        FluentTranslator(
-            locale="ru",
-            translator=FluentBundle.from_files(
-                "ru-RU",
-                filenames=["app/src/i18n/ru/text.ftl", "app/src/i18n/ru/button.ftl"],
-            ),
-        ),
-        FluentTranslator(
-            locale="en",
-            translator=FluentBundle.from_files(
-                "en-US",
-                filenames=["app/src/i18n/en/text.ftl", "app/src/i18n/en/button.ftl"],
-            ),
-        ),
-    ],
-    root_locale="ru",
-)
+t_hub = create_translator_hub()
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 
 
-async def main():
-    bot = Bot(
-        token=settings.BOT_TOKEN,
-        default=DefaultBotProperties(parse_mode=ParseMode.MARKDOWN_V2),
-    )  # подходит для .ftl файлов
-    dp = Dispatcher(t_hub=t_hub)
+def create_dispatcher(resume_broadcasts: bool = True) -> Dispatcher:
+    """Собирает диспетчер с роутерами и мидлварями (одинаково для polling и webhook)."""
+    dp = Dispatcher(
+        storage=create_fsm_storage(), t_hub=t_hub, resume_broadcasts=resume_broadcasts
+    )
 
     dp.include_router(main_router)
 
-    dp.message.middleware(ThrottlingMiddleware())
+    dp.update.outer_middleware(DeadlineMiddleware())
+
+    dp.message.middleware(ThrottlingMiddleware(create_throttle_backend("message")))
     dp.message.middleware(TranslateMiddleware())
     dp.message.middleware(UserMiddleware())
 
-    dp.callback_query.middleware(ThrottlingMiddleware())
+    dp.callback_query.middleware(ThrottlingMiddleware(create_throttle_backend("callback")))
     dp.callback_query.middleware(TranslateMiddleware())
-    dp.callback_query(UserMiddleware())
+    dp.callback_query.middleware(UserMiddleware())
+
+    dp.startup.register(on_startup)
+    dp.shutdown.register(on_shutdown)
+    return dp
+
+
+def create_bot() -> Bot:
+    return Bot(
+        token=settings.BOT_TOKEN,
+        default=DefaultBotProperties(parse_mode=ParseMode.MARKDOWN_V2),
+    )  # подходит для .ftl файлов
+
+
+async def on_startup(bot: Bot, dispatcher: Dispatcher, resume_broadcasts: bool) -> None:
+    await start_db()
+    await prune_match_archive()  # архив не растёт, даже если между деплоями мало новых матчей
+    await start_http_session()
+    load_heroes_snapshot()
+    await prebuild_keyboards(t_hub)
+    dispatcher["background_tasks"] = [
+        asyncio.create_task(run_request_counts_flusher()),
+        asyncio.create_task(run_heroes_refresher()),
+    ]
+    if resume_broadcasts:
+        await resume_unfinished_broadcast(bot)
+
+
+async def on_shutdown(dispatcher: Dispatcher) -> None:
+    await stop_broadcasts()
+    background_tasks = dispatcher.workflow_data.pop("background_tasks", [])
+    for task in background_tasks:
+        task.cancel()
+    # дожидаемся отмены, чтобы флашер вернул незаписанный пакет до финального сброса
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await flush_request_counts()
+    await stop_db()
+    await close_http_session()
+    await close_redis()
+
+
+async def main():
+    """Long polling в одном процессе (для разработки)."""
+    bot = create_bot()
+    dp = create_dispatcher()
 
     try:
         await bot.delete_webhook(drop_pending_updates=True)
-        await start_db()
         await dp.start_polling(bot)
     except ValueError as e:
         logging.error("ValueError occurred: %s: ", e)
@@ -74,9 +114,104 @@ async def main():
         await bot.session.close()
 
 
+async def prepare_webhook() -> None:
+    """Один раз перед запуском воркеров: создаёт таблицы и регистрирует webhook."""
+    await start_db()
+    await stop_db()  # соединения не должны достаться воркерам после fork
+
+    bot = create_bot()
+    try:
+        await bot.set_webhook(
+            url=settings.WEBHOOK_BASE_URL.rstrip("/") + settings.WEBHOOK_PATH,
+            secret_token=settings.WEBHOOK_SECRET or None,
+            allowed_updates=main_router.resolve_used_update_types(),
+            drop_pending_updates=True,
+        )
+        logging.info("Webhook установлен: %s%s", settings.WEBHOOK_BASE_URL, settings.WEBHOOK_PATH)
+    finally:
+        await bot.session.close()
+
+
+def create_webhook_app(resume_broadcasts: bool = True) -> web.Application:
+    bot = create_bot()
+    dp = create_dispatcher(resume_broadcasts=resume_broadcasts)
+
+    app = web.Application()
+    setup_application(app, dp, bot=bot)
+    SimpleRequestHandler(
+        dispatcher=dp, bot=bot, secret_token=settings.WEBHOOK_SECRET or None
+    ).register(app, path=settings.WEBHOOK_PATH)
+    return app
+
+
+def run_webhook_worker(worker_index: int) -> None:
+    """
+    Один воркер webhook-сервера. Все воркеры слушают один порт (SO_REUSEPORT),
+    незавершённую рассылку продолжает только первый из них.
+    """
+    logging.info("Воркер %s запущен", worker_index)
+    loop = asyncio.new_event_loop()
+
+    def graceful_exit() -> None:
+        # SIGTERM может прийти дважды (от главного процесса и от системы всей группе),
+        # повторный сигнал не должен прерывать on_shutdown
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.remove_signal_handler(signum)
+            signal.signal(signum, signal.SIG_IGN)
+        raise web.GracefulExit()
+
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, graceful_exit)
+
+    web.run_app(
+        create_webhook_app(resume_broadcasts=worker_index == 0),
+        host=settings.WEB_HOST,
+        port=settings.WEB_PORT,
+        reuse_port=settings.WEB_WORKERS > 1,
+        print=None,
+        handle_signals=False,
+        loop=loop,
+    )
+
+
+def run_webhook() -> None:
+    if settings.WEB_WORKERS > 1 and not settings.REDIS_URL:
+        logging.warning("REDIS_URL не задан: у каждого воркера будут свои состояния FSM, лимиты и кэш языков")
+
+    asyncio.run(prepare_webhook())
+
+    if settings.WEB_WORKERS == 1:
+        run_webhook_worker(0)
+        return
+
+    workers = [
+        multiprocessing.Process(target=run_webhook_worker, args=(index,))
+        for index in range(settings.WEB_WORKERS)
+    ]
+    for worker in workers:
+        worker.start()
+
+    def stop_workers(signum, frame) -> None:
+        logging.info("Получен сигнал %s, останавливаю воркеры", signal.Signals(signum).name)
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()  # SIGTERM: воркер выполнит on_shutdown и завершится
+
+    # docker stop шлёт SIGTERM только главному процессу — передаём его воркерам.
+    # Ctrl+C терминал отправляет всей группе процессов, воркеры получат SIGINT сами,
+    # а главный процесс должен дождаться их завершения
+    signal.signal(signal.SIGTERM, stop_workers)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for worker in workers:
+        worker.join()
+
+
 if __name__ == "__main__":
     try:
         logging.info("Бот запущен")
-        asyncio.run(main())
+        if settings.BOT_MODE == "webhook":
+            run_webhook()
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         logging.info("Бот выключен")
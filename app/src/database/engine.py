@@ -5,10 +5,29 @@ from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine, Asyn
 from ..utils.config import settings
 from ..database.models import Base
 
-engine = create_async_engine(
-    url=f"mysql+aiomysql://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}/{settings.DB_NAME}",
-    echo=True,
-)
+
+def get_database_url() -> str:
+    if settings.DB_DRIVER.startswith("sqlite"):
+        return f"{settings.DB_DRIVER}:///{settings.DB_NAME}"
+
+    host = f"{settings.DB_HOST}:{settings.DB_PORT}" if settings.DB_PORT else settings.DB_HOST
+    return f"{settings.DB_DRIVER}://{settings.DB_USER}:{settings.DB_PASSWORD}@{host}/{settings.DB_NAME}"
+
+
+def get_engine_options() -> dict:
+    if settings.DB_DRIVER.startswith("sqlite"):
+        return {"echo": settings.DB_ECHO}  # у SQLite нет сетевого пула соединений
+
+    return {
+        "echo": settings.DB_ECHO,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+engine = create_async_engine(url=get_database_url(), **get_engine_options())
 
 async_session = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
@@ -16,3 +35,7 @@ async_session = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncS
 async def start_db():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+
+
+async def stop_db():
+    await engine.dispose()
@@ -1,4 +1,4 @@
-from sqlalchemy import DateTime, String, BigInteger, func, Integer
+from sqlalchemy import DateTime, String, BigInteger, func, Integer, LargeBinary, Text, Boolean
 from sqlalchemy.orm import Mapped, mapped_column, DeclarativeBase
 from sqlalchemy.ext.asyncio import AsyncAttrs
 
@@ -16,7 +16,7 @@ class User(Base):
     tg_id: Mapped[int] = mapped_column(BigInteger, unique=True, nullable=False)
     name: Mapped[str] = mapped_column(String(255))
     language: Mapped[str] = mapped_column(String(2), nullable=True)
-    number_of_requests: Mapped[int] = mapped_column(default=0, nullable=False)
+    number_of_requests: Mapped[int] = mapped_column(default=0, nullable=False, index=True)
 
 
 class Transaction(Base):
@@ -32,3 +32,21 @@ class Profile(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     tg_id: Mapped[int] = mapped_column(BigInteger, unique=True, nullable=False)
     account_id: Mapped[int] = mapped_column(BigInteger, unique=True, nullable=False)
+
+
+class MatchArchive(Base):
+    __tablename__ = "match_archive"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    match_id: Mapped[int] = mapped_column(BigInteger, unique=True, nullable=False)
+    payload: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+
+class BroadcastJob(Base):
+    __tablename__ = "broadcasts"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+    chat_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    last_user_id: Mapped[int] = mapped_column(default=0, nullable=False)
+    sent: Mapped[int] = mapped_column(default=0, nullable=False)
+    failed: Mapped[int] = mapped_column(default=0, nullable=False)
+    finished: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
@@ -1,44 +1,113 @@
 """Request to Redis"""
 
+import asyncio
+from collections import Counter
+from dataclasses import dataclass
 from datetime import datetime
+import json
 import logging
-from typing import Dict, List
+import zlib
+from typing import Dict, List, Optional, Tuple
 
-from sqlalchemy import BigInteger, select
+from cachetools import TTLCache
+from redis.exceptions import RedisError
+from sqlalchemy import BigInteger, bindparam, delete, func, select, update
+from sqlalchemy.exc import IntegrityError
 
 from ..database.engine import async_session
-from ..database.models import User, Transaction, Profile
+from ..database.models import User, Transaction, Profile, MatchArchive, BroadcastJob
+from ..utils.config import settings
+from ..utils.storage import get_redis
 
 
-async def set_user(tg_id: int, name: str) -> None:
-    """Добавляет пользователя в БД, если его ещё там нет"""
+# tg_id -> выбранный язык ("" — не выбран); наличие ключа значит, что пользователь есть в БД
+_user_cache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL)
+
+
+async def _get_cached_language(tg_id: int) -> Optional[str]:
+    """
+    Язык пользователя из кэша или None при промахе. С Redis кэш языков общий для
+    всех воркеров, иначе смена языка в одном воркере не видна в остальных.
+    """
+    redis = get_redis()
+    if redis is None:
+        return _user_cache.get(tg_id)
+
     try:
+        language = await redis.get(f"{settings.REDIS_LANGUAGE_PREFIX}:{tg_id}")
+    except RedisError as e:
+        logging.warning("Не удалось прочитать язык %s из Redis: %s", tg_id, e)
+        return None
+    return None if language is None else language.decode()
+
+
+async def _cache_language(tg_id: int, language: str) -> None:
+    _user_cache[tg_id] = language
+
+    redis = get_redis()
+    if redis is not None:
+        try:
+            await redis.set(
+                f"{settings.REDIS_LANGUAGE_PREFIX}:{tg_id}", language, ex=settings.USER_CACHE_TTL
+            )
+        except RedisError as e:
+            logging.warning("Не удалось записать язык %s в Redis: %s", tg_id, e)
+
+
+async def set_user(tg_id: int, name: Optional[str]) -> bool:
+    """Добавляет пользователя в БД, если его ещё там нет. Возвращает True, если пользователь создан"""
+    if tg_id in _user_cache:
+        return False
+
+    try:
+        async with async_session() as session:
+            # у пользователя может не быть username, а name в таблице обязателен
+            session.add(User(tg_id=tg_id, name=name or str(tg_id)))
+            await session.commit()
+    except IntegrityError:
+        # пропускаем только конфликт по tg_id (пользователь уже есть), остальное — ошибка
         async with async_session() as session:
             user = await session.scalar(select(User).where(User.tg_id == tg_id))
-            if not user:
-                session.add(User(tg_id=tg_id, name=name))
-                await session.commit()
-                logging.info(f"Пользователь {tg_id} успешно зарегистрирован!")
+        if user is None:
+            logging.error("Ошибка в set_user: не удалось добавить пользователя %s", tg_id, exc_info=True)
+            raise
+        await _cache_language(tg_id, user.language or "")
+        return False
     except Exception as e:
         logging.error(f"Ошибка в set_user: {e}", exc_info=True)
         raise
 
+    logging.info(f"Пользователь {tg_id} успешно зарегистрирован!")
+    await _cache_language(tg_id, "")
+    return True
 
-async def get_users() -> List[Dict]:
-    """Возвращает список пользователей из БД"""
+
+async def count_users() -> int:
+    """Возвращает количество пользователей"""
     try:
         async with async_session() as session:
-            result = await session.execute(select(User))
-            users = result.scalars().all()
-            user_data = []
-            for user in users:
-                user_data.append(
-                    {"user": user.name, "number_of_requests": user.number_of_requests}
-                )
-            return user_data
+            return await session.scalar(select(func.count()).select_from(User))
     except Exception as e:
-        logging.error(f"Ошибка в get_users: {e}", exc_info=True)
-        return []
+        logging.error("Ошибка в count_users: %s", e, exc_info=True)
+        raise
+
+
+async def get_top_users(limit: int = 5) -> List[Dict]:
+    """Возвращает пользователей с наибольшим кол-вом запросов"""
+    try:
+        async with async_session() as session:
+            result = await session.execute(
+                select(User.name, User.number_of_requests)
+                .order_by(User.number_of_requests.desc())
+                .limit(limit)
+            )
+            return [
+                {"user": row.name, "number_of_requests": row.number_of_requests}
+                for row in result
+            ]
+    except Exception as e:
+        logging.error("Ошибка в get_top_users: %s", e, exc_info=True)
+        raise
 
 
 async def save_user_language(tg_id: int, language: str) -> None:
@@ -49,6 +118,7 @@ async def save_user_language(tg_id: int, language: str) -> None:
 
             query.language = language
             await session.commit()
+        await _cache_language(tg_id, language)
 
     except Exception as e:
         logging.error(f"Ошибка в select_user_language: {e}", exc_info=True)
@@ -57,11 +127,17 @@ async def save_user_language(tg_id: int, language: str) -> None:
 
 async def check_language_user(tg_id: int) -> str:
     """Помогает middleware просмотреть какой язык использует пользователь"""
+    language = await _get_cached_language(tg_id)
+    if language is not None:
+        return language
+
     try:
         async with async_session() as session:
             query = await session.scalar(select(User).where(User.tg_id == tg_id))
             if query:
-                return query.language if query.language else ""
+                language = query.language or ""
+                await _cache_language(tg_id, language)
+                return language
             else:
                 return ""
 
@@ -70,16 +146,52 @@ async def check_language_user(tg_id: int) -> str:
         return ""  # возвращаю пустую строку если произошла ошибка
 
 
+# tg_id -> ещё не записанные в БД запросы пользователя
+_pending_request_counts: Counter = Counter()
+
+
 async def increment_user_request_count(tg_id: int):
-    """Увеличивает кол-во запросов пользователя в бота на единицу"""
+    """Увеличивает кол-во запросов пользователя в бота на единицу (запись в БД — в flush_request_counts)"""
+    _pending_request_counts[tg_id] += 1
+
+
+async def flush_request_counts() -> None:
+    """Записывает накопленные счётчики запросов в БД одним пакетным UPDATE"""
+    if not _pending_request_counts:
+        return
+
+    pending = dict(_pending_request_counts)
+    _pending_request_counts.clear()
+
+    users = User.__table__
+    statement = (
+        update(users)
+        .where(users.c.tg_id == bindparam("user_tg_id"))
+        .values(number_of_requests=users.c.number_of_requests + bindparam("delta"))
+    )
+    committed = False
     try:
         async with async_session() as session:
-            user = await session.scalar(select(User).where(User.tg_id == tg_id))
-            user.number_of_requests += 1
+            await session.execute(
+                statement,
+                [{"user_tg_id": tg_id, "delta": delta} for tg_id, delta in pending.items()],
+            )
             await session.commit()
-    except Exception as e:
-        logging.error("Ошибка в increment_user_request_count: %e", e, exc_info=True)
+            committed = True
+    except asyncio.CancelledError:
+        if not committed:  # задачу отменили посреди записи — сбросим при остановке
+            _pending_request_counts.update(pending)
         raise
+    except Exception as e:
+        _pending_request_counts.update(pending)  # не теряем счётчики, попробуем в следующий раз
+        logging.error("Ошибка в flush_request_counts: %s", e, exc_info=True)
+
+
+async def run_request_counts_flusher() -> None:
+    """Фоновая задача: периодически сбрасывает счётчики запросов в БД"""
+    while True:
+        await asyncio.sleep(settings.REQUEST_COUNTS_FLUSH_INTERVAL)
+        await flush_request_counts()
 
 
 async def check_user_requests(tg_id: int) -> int:
@@ -87,7 +199,7 @@ async def check_user_requests(tg_id: int) -> int:
     try:
         async with async_session() as session:
             query = await session.scalar(select(User).where(User.tg_id == tg_id))
-            return query.number_of_requests
+            return query.number_of_requests + _pending_request_counts[tg_id]
     except Exception as e:
         logging.error("Ошибка в check_user_requests: %e", e, exc_info=True)
         raise
@@ -129,6 +241,42 @@ async def get_last_date_usage_bot(tg_id: int) -> datetime:
         raise
 
 
+@dataclass
+class UserProfileSnapshot:
+    number_of_requests: int
+    first_request: datetime
+    last_request: datetime
+    account_id: Optional[int] = None  # None — аккаунт Dota 2 не привязан
+
+
+async def get_user_profile_snapshot(tg_id: int) -> Optional[UserProfileSnapshot]:
+    """Возвращает статистику пользователя и привязанный аккаунт одним запросом"""
+    try:
+        async with async_session() as session:
+            result = await session.execute(
+                select(
+                    User.number_of_requests,
+                    User.created,
+                    User.updated,
+                    Profile.account_id,
+                )
+                .outerjoin(Profile, Profile.tg_id == User.tg_id)
+                .where(User.tg_id == tg_id)
+            )
+            row = result.first()
+            if row is None:
+                return None
+            return UserProfileSnapshot(
+                number_of_requests=row.number_of_requests + _pending_request_counts[tg_id],
+                first_request=row.created,
+                last_request=row.updated,
+                account_id=row.account_id,
+            )
+    except Exception as e:
+        logging.error("Ошибка в get_user_profile_snapshot: %s", e, exc_info=True)
+        raise
+
+
 async def check_user_in_profile_table(tg_id: int) -> bool:
     """Проверяет, находится ли пользователь в таблице "profiles" и возвращает булевое значение"""
     try:
@@ -151,19 +299,33 @@ async def get_account_id_in_profile(tg_id: int) -> BigInteger:
         raise
 
 
-async def register_user_in_profile_table(tg_id: int, account_id: int):
-    """Записывает пользователя в таблицу "profiles"."""
+async def register_user_in_profile_table(tg_id: int, account_id: int) -> bool:
+    """
+    Записывает пользователя в таблицу "profiles". Возвращает True, если запись создана,
+    и False, если у пользователя уже есть аккаунт или этот аккаунт привязан другим.
+    """
     try:
         async with async_session() as session:
-            user = await session.scalar(select(Profile).where(Profile.tg_id == tg_id))
-            if not user:
-                session.add(Profile(tg_id=tg_id, account_id=account_id))
-                await session.commit()
-                logging.info("Пользователь %s успешно зарегистрирован в таблице 'profiles'!", tg_id)
+            session.add(Profile(tg_id=tg_id, account_id=account_id))
+            await session.commit()
+    except IntegrityError:
+        async with async_session() as session:
+            existing = await session.scalar(
+                select(Profile).where(
+                    (Profile.tg_id == tg_id) | (Profile.account_id == account_id)
+                )
+            )
+        if existing is None:
+            logging.error("Ошибка в register_user_in_profile_table", exc_info=True)
+            raise
+        return False
     except Exception as e:
         logging.error("Ошибка в register_user_in_profile_table: %s", e, exc_info=True)
         raise
 
+    logging.info("Пользователь %s успешно зарегистрирован в таблице 'profiles'!", tg_id)
+    return True
+
 
 async def unregister_user_in_profile_table(tg_id: int):
     """Удаляет полязователя с таблицы "profiles"."""
@@ -174,4 +336,130 @@ async def unregister_user_in_profile_table(tg_id: int):
             await session.commit()
     except Exception as e:
         logging.error("Ошибка в unregister_user_in_profile_table: %s", e, exc_info=True)   
-        raise e
\ No newline at end of file
+        raise e
+
+
+async def get_archived_match(match_id: int) -> Optional[Dict]:
+    """Возвращает сохранённые данные матча из архива или None."""
+    try:
+        async with async_session() as session:
+            payload = await session.scalar(
+                select(MatchArchive.payload).where(MatchArchive.match_id == match_id)
+            )
+            if payload is None:
+                return None
+            return json.loads(zlib.decompress(payload))
+    except Exception as e:
+        logging.error("Ошибка в get_archived_match: %s", e, exc_info=True)
+        return None
+
+
+async def archive_match(match_id: int, data: Dict) -> None:
+    """Сохраняет данные завершённого матча в архив в сжатом виде."""
+    payload = zlib.compress(
+        json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+    )
+    try:
+        async with async_session() as session:
+            archived = MatchArchive(match_id=match_id, payload=payload)
+            session.add(archived)
+            await session.flush()
+            archived_id = archived.id
+            await session.commit()
+    except IntegrityError:
+        return  # матч уже сохранён параллельным запросом
+    except Exception as e:
+        logging.error("Ошибка в archive_match: %s", e, exc_info=True)
+        return
+
+    # очистку запускает каждая MATCH_ARCHIVE_PRUNE_EVERY-я запись по id из БД — общему
+    # для всех воркеров и не сбрасываемому перезапуском счётчику
+    if archived_id % settings.MATCH_ARCHIVE_PRUNE_EVERY == 0:
+        await prune_match_archive()
+
+
+async def prune_match_archive() -> None:
+    """
+    Удаляет самые старые матчи, оставляя последние MATCH_ARCHIVE_MAX_MATCHES
+    (по порогу id, без сканирования таблицы).
+    """
+    try:
+        async with async_session() as session:
+            max_id = await session.scalar(select(func.max(MatchArchive.id)))
+            if max_id is None:
+                return
+            threshold = max_id - settings.MATCH_ARCHIVE_MAX_MATCHES + 1
+            if threshold <= 1:
+                return
+            await session.execute(
+                delete(MatchArchive).where(MatchArchive.id < threshold)
+            )
+            await session.commit()
+    except Exception as e:
+        logging.error("Ошибка в prune_match_archive: %s", e, exc_info=True)
+
+
+async def get_user_ids_page(after_id: int, limit: int) -> List[Tuple[int, int]]:
+    """Возвращает следующую страницу пар (id, tg_id) пользователей после after_id"""
+    try:
+        async with async_session() as session:
+            result = await session.execute(
+                select(User.id, User.tg_id)
+                .where(User.id > after_id)
+                .order_by(User.id)
+                .limit(limit)
+            )
+            return [(row.id, row.tg_id) for row in result]
+    except Exception as e:
+        logging.error("Ошибка в get_user_ids_page: %s", e, exc_info=True)
+        raise
+
+
+async def create_broadcast(text: str, chat_id: int) -> BroadcastJob:
+    """Создаёт рассылку; chat_id — чат, куда отправлять прогресс"""
+    try:
+        async with async_session() as session:
+            job = BroadcastJob(text=text, chat_id=chat_id)
+            session.add(job)
+            await session.commit()
+            return job
+    except Exception as e:
+        logging.error("Ошибка в create_broadcast: %s", e, exc_info=True)
+        raise
+
+
+async def get_unfinished_broadcast() -> Optional[BroadcastJob]:
+    """Возвращает незавершённую рассылку (например, прерванную падением бота)"""
+    try:
+        async with async_session() as session:
+            return await session.scalar(
+                select(BroadcastJob)
+                .where(BroadcastJob.finished.is_(False))
+                .order_by(BroadcastJob.id)
+                .limit(1)
+            )
+    except Exception as e:
+        logging.error("Ошибка в get_unfinished_broadcast: %s", e, exc_info=True)
+        raise
+
+
+async def save_broadcast_progress(
+    broadcast_id: int, last_user_id: int, sent: int, failed: int, finished: bool = False
+) -> None:
+    """Сохраняет прогресс рассылки: все пользователи с id <= last_user_id уже обработаны"""
+    try:
+        async with async_session() as session:
+            await session.execute(
+                update(BroadcastJob)
+                .where(BroadcastJob.id == broadcast_id)
+                .values(
+                    last_user_id=last_user_id,
+                    sent=sent,
+                    failed=failed,
+                    finished=finished,
+                )
+            )
+            await session.commit()
+    except Exception as e:
+        logging.error("Ошибка в save_broadcast_progress: %s", e, exc_info=True)
+        raise
@@ -1,6 +1,4 @@
-import asyncio
 import logging
-from typing import List
 
 from aiogram import Bot, F, Router
 from aiogram.types import Message, CallbackQuery
@@ -9,8 +7,11 @@ from aiogram.filters import Filter, Command
 
 from .states import Broadcast
 from ...utils.config import settings
-from ...utils.keyboards import get_inline_buttons
-from ...database.requests import get_users
+from ...utils.keyboards import get_confirm_keyboard
+from ...database.requests import count_users, get_top_users
+from ...parsers.opendota import scheduler
+from ...utils.broadcast import start_new_broadcast
+from ...utils.middlewares import throttling_stats
 
 router = Router()
 
@@ -41,36 +42,30 @@ async def _(message: Message, state: FSMContext):
 async def _(message: Message, state: FSMContext):
     await state.update_data(message=message.text)
     await message.answer(f'Ваш текст: \n"{message.text}"\n\nПодтверждаете отправку?',
-                         reply_markup=await get_inline_buttons(btns={'confirm': 'Подтверждаю ✅',
-                                                                     'cancel': 'Отменить ❌'}, ), parse_mode='')
+                         reply_markup=await get_confirm_keyboard(), parse_mode='')
     await state.set_state(Broadcast.confirm)
 
 
 @router.callback_query(AdminProtect(), Broadcast.confirm, F.data == 'confirm')
 async def _(callback: CallbackQuery, state: FSMContext, bot: Bot):
     await callback.answer()
-    await callback.message.edit_text("Сообщение принято, начинаю рассылку\.\.\.💭")
 
     data = await state.get_data()
-    text = data.get('message')
-    users: List[int] = await get_users()
-
-    total_users = len(users)
-    successful_count = 0
-    failed_count = 0
-    for user_id in users:
-        success = await send_message_to_user(bot, user_id, text)
-        if success:
-            successful_count += 1
-        else:
-            failed_count += 1
+    try:
+        job = await start_new_broadcast(bot, data.get('message'), callback.message.chat.id)
+    except Exception as e:
+        logging.error(f"Не удалось запустить рассылку: {e}", exc_info=True)
+        await callback.message.edit_text("Не удалось запустить рассылку, попробуйте позже\.")
+        await state.clear()
+        return
 
-        await asyncio.sleep(0.05)
+    if job is None:
+        await callback.message.edit_text("Предыдущая рассылка ещё не завершена\.")
+    else:
+        await callback.message.edit_text("Сообщение принято, начинаю рассылку\.\.\.💭")
 
     await state.clear()
 
-    await callback.message.answer(f"Рассылка завершена\. \nИз {total_users} пользователей сообщение отправлено: \nУспешно: {successful_count}\nПровально: {failed_count}")
-
 
 @router.callback_query(AdminProtect(), Broadcast.confirm, F.data == 'cancel')
 async def cancel_broadcast(callback: CallbackQuery, state: FSMContext):
@@ -81,26 +76,22 @@ async def cancel_broadcast(callback: CallbackQuery, state: FSMContext):
 
 @router.message(AdminProtect(), Command('statistics'))
 async def get_statistics_bot(message: Message):
-    table = await get_users()
-
-    if not table:
+    try:
+        user_count = await count_users()
+        top_users = await get_top_users(5)
+    except Exception:
         await message.answer("Не удалось получить статистику пользователей.")
         return
 
-    user_count = len(table)
     top_five_users = [
         f"Имя: {element['user']}, кол\-во запросов: {element['number_of_requests']}\n"
-        for element in table[:5] 
+        for element in top_users
     ]
-    text = f"Количество пользователей: {user_count}\nТоп 5 пользователей:\n{''.join(top_five_users)}"
+    text = (
+        f"Количество пользователей: {user_count}\nТоп 5 пользователей:\n{''.join(top_five_users)}"
+        f"\nОчередь запросов к OpenDota: {scheduler.queue_depth}"
+        f"\nТроттлинг: отброшено {throttling_stats['throttled']}, "
+        f"в очереди {throttling_stats['queued']}, объединено {throttling_stats['merged']}"
+    )
 
     await message.answer(text)
-
-async def send_message_to_user(bot: Bot, tg_id: int, message: str) -> bool:
-    """Отправляет конкретному пользователю сообщение"""
-    try:
-        await bot.send_message(chat_id=tg_id, text=f'Вам было отправлено сообщение: \n\n{message}', parse_mode='HTML')
-        return True
-    except Exception as e:
-        logging.error(f'Возникла ошибка при отправке рассылке сообщения пользователю {tg_id}: {e}')
-        return False
@@ -11,19 +11,18 @@ from ....database.requests import (
     check_language_user,
     save_user_language,
     increment_user_request_count,
-    check_user_requests,
-    get_first_date_usage_bot,
-    get_last_date_usage_bot,
-    check_user_in_profile_table,
+    get_user_profile_snapshot,
     get_account_id_in_profile,
     unregister_user_in_profile_table
 )
 from ....utils.keyboards import (
+    get_back_keyboard,
     get_inline_buttons,
+    get_language_keyboard,
     get_start_keyboard_page_1,
     get_start_keyboard_page_2,
 )
-from ....parsers.info import get_info_about_players_of_match
+from ....utils.match_view import get_match_players_view
 from .other import process_account_id, show_page, show_carousel
 from .states import Info, AnotherInfo
 
@@ -40,9 +39,7 @@ async def show_main_menu(
     if language == "":
         await callback.message.answer(
             text=locale.language.select(),
-            reply_markup=await get_inline_buttons(
-                btns={"select_ru": "Русский", "select_en": "English"}
-            ),
+            reply_markup=await get_language_keyboard(),
         )
     else:
         await callback.message.answer(
@@ -58,9 +55,7 @@ async def change_language(callback: CallbackQuery, locale: TranslatorRunner):
 
     await callback.message.answer(
         text=locale.language.select(),
-        reply_markup=await get_inline_buttons(
-            btns={"select_ru": "Русский", "select_en": "English"}
-        ),
+        reply_markup=await get_language_keyboard(),
     )
 
 
@@ -127,14 +122,13 @@ async def handler_get_info_about_players(
         return
 
     try:
-        players_data = await get_info_about_players_of_match(match_id, locale)
-        await state.update_data(players_data=players_data)
+        view = await get_match_players_view(match_id, locale)
 
-        if not players_data:
+        if view is None:
             await callback.answer(locale.no_information_about_players_of_match())
             return
 
-        await show_page(callback, state, 0, locale)
+        await show_page(callback, state, 0, locale, view=view)
 
     except Exception as e:
         logging.error(f"Ошибка handler_get_info_about_players: {e}", exc_info=True)
@@ -178,16 +172,17 @@ async def handler_user_profile(
 ):
     await callback.answer()
 
-    user_in_table = await check_user_in_profile_table(callback.from_user.id)
-    count_user_requests = await check_user_requests(callback.from_user.id)
-    first_request = await get_first_date_usage_bot(callback.from_user.id)
-    last_request = await get_last_date_usage_bot(callback.from_user.id)
+    snapshot = await get_user_profile_snapshot(callback.from_user.id)
+    if snapshot is None:
+        await callback.message.answer(locale.unexpected_error())
+        return
+    user_in_table = snapshot.account_id is not None
 
     text = (
         f"{locale.name()} {callback.from_user.full_name}\n"
-        f"{locale.user_requests()} {count_user_requests}\n"
-        f"{locale.date_registration()} {first_request}\n"
-        f"{locale.last_request()} {last_request}\n\n"
+        f"{locale.user_requests()} {snapshot.number_of_requests}\n"
+        f"{locale.date_registration()} {snapshot.first_request}\n"
+        f"{locale.last_request()} {snapshot.last_request}\n\n"
         f"{locale.account_is_not_linken() if not user_in_table else locale.account_is_linken()}"
     )
 
@@ -236,7 +231,7 @@ async def handler_unlink_account(
     await callback.answer()
     await unregister_user_in_profile_table(callback.from_user.id)
     await callback.message.answer(locale.account_unlinken(), 
-                                  reply_markup=await get_inline_buttons(btns={"back": locale.back()}))
+                                  reply_markup=await get_back_keyboard(locale))
 
 @router.callback_query(F.data.startswith("page:"))
 async def process_pagination(
@@ -21,7 +21,9 @@ from ....database.requests import (
 )
 from ....utils.formatted_output import format_button_result, format_general_match_info
 from ....utils.keyboards import (
+    get_back_keyboard,
     get_inline_buttons,
+    get_language_keyboard,
     account_buttons,
     get_start_keyboard_page_2,
     get_start_keyboard_page_1,
@@ -40,9 +42,7 @@ async def show_main_menu(message: Message, state: FSMContext, locale: Translator
     if language == "":
         await message.answer(
             text=locale.language.select(),
-            reply_markup=await get_inline_buttons(
-                btns={"select_ru": "Русский", "select_en": "English"}
-            ),
+            reply_markup=await get_language_keyboard(),
         )
     else:
         await message.answer(
@@ -82,8 +82,6 @@ async def handler_get_match_id(
             ),
         )
 
-        await state.update_data(number_pages_for_match=int(query["quantity_players"]))
-
     except ValidationError as e:
         await message.answer(locale.error_validation())
         logging.exception(
@@ -140,12 +138,12 @@ async def handler_check_account_id(
         account_id = AccountSchema(account_id=int(message.text))
         query = await get_info_about_account(account_id.account_id, locale)
         if query:
-            await register_user_in_profile_table(
+            created = await register_user_in_profile_table(
                 message.from_user.id, account_id.account_id
             )
             await message.answer(
-                locale.account_is_linken(),
-                reply_markup=await get_inline_buttons(btns={"back": locale.back()}),
+                locale.account_is_linken() if created else locale.account_already_linken(),
+                reply_markup=await get_back_keyboard(locale),
             )
             await state.clear()
     except ValidationError as e:
@@ -159,7 +157,7 @@ async def handler_check_account_id(
     except Exception as e:
         await message.answer(
             locale.unexpected_error(),
-            reply_markup=await get_inline_buttons(btns={"back": locale.back()}),
+            reply_markup=await get_back_keyboard(locale),
         )
         logging.error("Ошибка в handler_check_account_id: %e", e, exc_info=True)
         await state.clear()
@@ -1,7 +1,7 @@
 """Helper functions for handlers"""
 
 import logging
-import json
+from typing import Optional
 
 from aiogram import Bot
 from aiogram.types import CallbackQuery
@@ -12,7 +12,8 @@ from pydantic import ValidationError
 
 from ....utils.schemas import AccountSchema
 from ....parsers.info import AccountInfo, get_info_about_account
-from ....utils.formatted_output import format_account_info, format_player_info_in_match
+from ....utils.formatted_output import format_account_info
+from ....utils.match_view import MatchPlayersView, get_match_players_view
 from ....utils.keyboards import (
     account_buttons,
     paginated_buttons,
@@ -83,25 +84,35 @@ async def show_carousel(
 
 
 async def show_page(
-    callback: CallbackQuery, state: FSMContext, page: int, locale: TranslatorRunner
+    callback: CallbackQuery,
+    state: FSMContext,
+    page: int,
+    locale: TranslatorRunner,
+    view: Optional[MatchPlayersView] = None,
 ):
-    """Функция для отображения страницы с пагинацией."""
-
-    data = await state.get_data()
-    players_data = data.get("players_data")
-    number_pages = data.get("number_pages_for_match", 1)
-
-    if players_data is None:
+    """
+    Функция для отображения страницы с пагинацией. view — уже собранный снимок матча,
+    чтобы не собирать его повторно (неполный снимок не кэшируется).
+    """
+
+    if view is None:
+        data = await state.get_data()
+        match_id = data.get("match_id")
+
+        try:
+            view = await get_match_players_view(match_id, locale) if match_id else None
+        except Exception as e:
+            logging.error("Произошла ошибка при отображении страницы в show_page: %s", e, exc_info=True)
+            await callback.answer(locale.error_sending())
+            return
+
+    if view is None:
         logging.error("Данные о игроках отсутствуют.")
         await callback.answer(locale.no_players_found())
         return
 
-    try:
-        text = format_player_info_in_match(json.loads(players_data), page, locale)
-    except Exception as e:
-        logging.error("Произошла ошибка при отображении страницы в show_page: %s", e, exc_info=True)
-        await callback.answer(locale.error_sending())
-        return
+    number_pages = len(view.pages)
+    text = view.pages[page] if 0 <= page < number_pages else locale.player_was_not_found()
 
     keyboard = await paginated_buttons(page, number_pages, locale)
     try:
@@ -36,6 +36,7 @@ lobby_type=Lobby type:
 game_mode=Mode: 
 account_unlinken=**The account is disconnected from your profile\.**
 account_is_linken=The account has been successfully linked\.
+account_already_linken=This Dota 2 account is already linked to another user\.
 account_is_not_linken=The account from Dota 2 is not linked\. Link an account for easy viewing of information\.
 last_request=The date of your last activity in the bot:
 date_registration=Date of registration in the bot:
@@ -54,6 +55,8 @@ number_matches=Number of matches:
 abandoned=Adandoned:
 match_id=Match ID:
 wr_last_20_matches=WR for the last 20 games:
+wr_last_100_matches=WR for the last 100 games:
+streak=Current streak:
 last_match=Last match:
 has_dplus_now=Dota plus Subscriber:
 country=Country:
@@ -61,6 +64,14 @@ account_id=Account ID:
 steam_id=Steam ID:
 team=Team:
 rank=Rank:
+rank_tier_1=Herald
+rank_tier_2=Guardian
+rank_tier_3=Crusader
+rank_tier_4=Archon
+rank_tier_5=Legend
+rank_tier_6=Ancient
+rank_tier_7=Divine
+rank_tier_8=Immortal
 kda=KDA:
 lvl=LVL:
 aghanim_scepter=Aghanim scepter:
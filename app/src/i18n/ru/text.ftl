@@ -36,6 +36,7 @@ lobby_type=Тип лобби:
 game_mode=Режим:
 account_unlinken=**Аккаунт отвязан от Вашего профиля\.** 
 account_is_linken=Аккаунт привязан\.
+account_already_linken=Этот аккаунт Dota 2 уже привязан другим пользователем\.
 account_is_not_linken=Аккаунт из Dota 2 не привязан\. Привяжите аккаунт для удобного просмотра информации\.
 last_request=Дата вашей последней активности в боте:
 date_registration=Дата регистрации в боте:
@@ -59,8 +60,18 @@ abandoned=Покинуто:
 match_id=ID матча:
 wr=WR - { $winrate }
 wr_last_20_matches=WR за последние 20 игр:
+wr_last_100_matches=WR за последние 100 игр:
+streak=Текущая серия:
 team=Команда:
 rank=Ранг:
+rank_tier_1=Рекрут
+rank_tier_2=Страж
+rank_tier_3=Рыцарь
+rank_tier_4=Герой
+rank_tier_5=Легенда
+rank_tier_6=Властелин
+rank_tier_7=Божество
+rank_tier_8=Титан
 kda=KDA:
 lvl=LVL:
 aghanim_scepter=Аганим скипетр:
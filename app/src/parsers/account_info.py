@@ -1,11 +1,19 @@
 """Parsing info about account"""
 
 import logging
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 
 import aiohttp
+from cachetools import TLRUCache
 from fluentogram import TranslatorRunner
-from bs4 import BeautifulSoup
+
+from ..parsers.deadline import get_request_timeout
+from ..parsers.http_client import get_http_session, single_flight
+from ..parsers.opendota import get_opendota_json
+from ..parsers.dotabuff import extract_rank_title, parse_rank_tier
+from ..utils.config import settings
+
+RANK_CHUNK_SIZE = 16 * 1024
 
 
 async def get_info_about_profile(account_id: int) -> Optional[Dict]:
@@ -13,10 +21,7 @@ async def get_info_about_profile(account_id: int) -> Optional[Dict]:
 
     url = f"https://api.opendota.com/api/players/{account_id}"
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                data = await response.json()
+        data = await get_opendota_json(url)
         return data
     except aiohttp.ClientError as e:
         logging.error(f"Ошибка при запросе профиля: {e}")
@@ -30,10 +35,7 @@ async def get_info_about_peers(account_id: int):
 
     url = f"https://api.opendota.com/api/players/{account_id}/peers"
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                data = await response.json()
+        data = await get_opendota_json(url)
         if not data:
             return None
         
@@ -56,10 +58,7 @@ async def get_info_about_heroes(account_id: int) -> Optional[Dict]:
 
     url = f"https://api.opendota.com/api/players/{account_id}/wardmap"
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                data = await response.json()
+        data = await get_opendota_json(url)
         return data
     except aiohttp.ClientError as e:
         logging.error(f"Ошибка при запросе героев: {e}")
@@ -74,10 +73,7 @@ async def get_info_about_wl(account_id: int) -> Optional[Dict]:
 
     wl_url = f"https://api.opendota.com/api/players/{account_id}/wl"
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(wl_url) as response:
-                response.raise_for_status()
-                data = await response.json()
+        data = await get_opendota_json(wl_url)
         return data
     except aiohttp.ClientError as e:
         logging.error(f"Ошибка при запросе WL: {e}")
@@ -87,56 +83,85 @@ async def get_info_about_wl(account_id: int) -> Optional[Dict]:
         return None
 
 
-async def get_winrate_last_twenty_matches(account_id: int) -> Optional[Dict]:
-    """Возвращает JSON с данными о проценте побед игрока за 20 игр."""
+async def get_recent_matches(account_id: int, limit: int) -> Optional[List[Dict]]:
+    """Возвращает JSON со списком последних limit матчей игрока."""
 
-    url = f"https://api.opendota.com/api/players/{account_id}/wl"
+    url = f"https://api.opendota.com/api/players/{account_id}/matches"
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params={"limit": 20}) as response:
-                response.raise_for_status()
-                data = await response.json()
+        data = await get_opendota_json(url, params={"limit": limit})
         return data
     except aiohttp.ClientError as e:
-        logging.error(f"Ошибка при запросе winrate (20): {e}")
+        logging.error("Ошибка при запросе последних матчей: %s", e)
         return None
     except Exception as e:
-        logging.error(f"Неизвестная ошибка при запросе winrate (20): {e}")
+        logging.error("Неизвестная ошибка при запросе последних матчей: %s", e)
         return None
 
 
-async def get_rank_account(account_id: int, locale: TranslatorRunner) -> str:
-    """Возвращает строчку с рангом игрока из DotaBuff"""
+def _rank_ttu(_account_id: int, rank_tier: Optional[int], now: float) -> float:
+    """Ранг храним дольше, чем отсутствие ранга (скрытый профиль, нет калибровки)."""
+    if rank_tier:
+        return now + settings.RANK_CACHE_TTL
+    return now + settings.RANK_MISSING_CACHE_TTL
+
+
+_rank_cache = TLRUCache(maxsize=settings.RANK_CACHE_SIZE, ttu=_rank_ttu)
+_MISSING = object()
+
+
+async def get_rank_tier(account_id: int) -> Optional[int]:
+    """Возвращает rank_tier игрока (например, 53 — Legend 3) из DotaBuff или кэша."""
+    # одним .get(): между проверкой и чтением запись может истечь, а None — валидный ранг
+    rank_tier = _rank_cache.get(account_id, _MISSING)
+    if rank_tier is not _MISSING:
+        return rank_tier
+
+    return await single_flight(("dotabuff", account_id), lambda: _scrape_rank_tier(account_id))
+
+
+async def _scrape_rank_tier(account_id: int) -> Optional[int]:
+    """
+    None — у игрока нет ранга. Ошибки запроса (не 200, таймаут) пробрасываются,
+    чтобы вызывающий код отличал их от отсутствия ранга и не кэшировал результат.
+    """
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:97.0) Gecko/20100101 Firefox/97.0"
     }
-    url = f"https://{locale.language()}.dotabuff.com/players/{account_id}"
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, "html.parser")
-
-                    rank_element = (soup.find("div", class_="rank-tier-wrapper")["title"].split(":")[1].strip())
-                    if rank_element:
-                        return rank_element
-                    else:
-                        return locale.unknown()
-                else:
-                    logging.error(f"Ошибка: {response.status}")
-    except Exception as e:
-        logging.error(f"Произошла ошибка: {e}")
+    url = f"https://www.dotabuff.com/players/{account_id}"
+    session = await get_http_session()
+    async with session.get(
+        url, headers=headers, timeout=get_request_timeout()
+    ) as response:
+        response.raise_for_status()
+        rank_title = await extract_rank_title(
+            response.content.iter_chunked(RANK_CHUNK_SIZE)
+        )
+
+    rank_tier = parse_rank_tier(rank_title)
+    _rank_cache[account_id] = rank_tier
+    return rank_tier
+
+
+def format_rank_tier(rank_tier: Optional[int], locale: TranslatorRunner) -> str:
+    """Возвращает название ранга на языке пользователя."""
+    if not rank_tier:
+        return locale.unknown()
+
+    medal, stars = divmod(rank_tier, 10)
+    name = locale.get(f"rank_tier_{medal}")
+    return f"{name} {stars}" if stars else name
+
+
+async def get_rank_account(account_id: int, locale: TranslatorRunner) -> str:
+    """Возвращает строчку с рангом игрока из DotaBuff. Ошибки запроса пробрасывает."""
+    return format_rank_tier(await get_rank_tier(account_id), locale)
 
 
 async def search_account_by_nickname(name: str) -> Optional[Dict]:
     """Возвращает информацию о найденных аккаунтах по заданному никнейму."""
     url = "https://api.opendota.com/api/search"
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params={"q": name}) as response:
-                response.raise_for_status()
-                data = await response.json()
+        data = await get_opendota_json(url, params={"q": name})
         return data
     except aiohttp.ClientError as e:
         logging.error("Ошибка при запросе (search_account_by_nickname): %e", e, exc_info=True)
@@ -0,0 +1,49 @@
+"""Deadline budget for upstream calls made while handling one update"""
+
+import asyncio
+import time
+from contextvars import ContextVar, Token
+from typing import Optional
+
+import aiohttp
+
+from ..utils.config import settings
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+def start_deadline(budget: float) -> Token:
+    """Запускает отсчёт дедлайна для текущего апдейта (и всех его задач)."""
+    return _deadline.set(time.monotonic() + budget)
+
+
+def reset_deadline(token: Token) -> None:
+    _deadline.reset(token)
+
+
+def remaining_budget() -> Optional[float]:
+    """Сколько секунд осталось до дедлайна; None, если дедлайн не задан."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def within_budget(timeout: Optional[float]) -> Optional[float]:
+    """Урезает timeout до оставшегося бюджета."""
+    remaining = remaining_budget()
+    if remaining is None:
+        return timeout
+    if timeout is None:
+        return remaining
+    return min(timeout, remaining)
+
+
+def get_request_timeout() -> aiohttp.ClientTimeout:
+    """Таймаут для одного запроса к внешнему API с учётом оставшегося бюджета."""
+    total = within_budget(settings.HTTP_TIMEOUT)
+    if total <= 0:
+        raise asyncio.TimeoutError("Дедлайн обработки апдейта истёк")
+    return aiohttp.ClientTimeout(
+        total=total, connect=min(total, settings.HTTP_CONNECT_TIMEOUT)
+    )
@@ -0,0 +1,68 @@
+"""Streaming extraction of the rank from a DotaBuff profile page"""
+
+import html
+import re
+from typing import AsyncIterator, Optional
+
+RANK_TAG_PATTERN = re.compile(rb"<div\b[^>]*\brank-tier-wrapper\b[^>]*>")
+TITLE_PATTERN = re.compile(rb'\btitle="([^"]*)"')
+
+MAX_TAIL_SIZE = 16 * 1024  # сколько байт переносим в следующий чанк в поисках тега
+
+MEDALS = (
+    "Herald",
+    "Guardian",
+    "Crusader",
+    "Archon",
+    "Legend",
+    "Ancient",
+    "Divine",
+    "Immortal",
+)
+STARS_PATTERN = re.compile(r"\b([1-5])\s*$")
+
+
+def parse_rank_title(tag: bytes) -> Optional[str]:
+    """Достаёт ранг из атрибута title тега rank-tier-wrapper ("Rank: Legend 3")."""
+    title = TITLE_PATTERN.search(tag)
+    if title is None:
+        return None
+
+    value = html.unescape(title.group(1).decode("utf-8", errors="replace"))
+    return value.split(":", 1)[-1].strip() or None
+
+
+def find_rank_title(page: bytes) -> Optional[str]:
+    """Ищет ранг в уже загруженной странице профиля."""
+    tag = RANK_TAG_PATTERN.search(page)
+    return parse_rank_title(tag.group(0)) if tag else None
+
+
+async def extract_rank_title(chunks: AsyncIterator[bytes]) -> Optional[str]:
+    """Читает страницу по частям и останавливается, как только найден тег с рангом."""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        tag = RANK_TAG_PATTERN.search(buffer)
+        if tag:
+            return parse_rank_title(tag.group(0))
+
+        # Тег мог оборваться на границе чанка — сохраняем хвост с последнего "<"
+        tail_start = buffer.rfind(b"<")
+        if tail_start == -1 or len(buffer) - tail_start > MAX_TAIL_SIZE:
+            buffer = b""
+        else:
+            buffer = buffer[tail_start:]
+    return None
+
+
+def parse_rank_tier(title: Optional[str]) -> Optional[int]:
+    """Переводит ранг с английской DotaBuff ("Legend 3") в rank_tier OpenDota (53)."""
+    if not title:
+        return None
+
+    for index, medal in enumerate(MEDALS, start=1):
+        if title.startswith(medal):
+            stars = STARS_PATTERN.search(title)
+            return index * 10 + (int(stars.group(1)) if stars and index < 8 else 0)
+    return None
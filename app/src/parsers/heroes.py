@@ -0,0 +1,70 @@
+"""Hero catalog: hero_id -> hero name"""
+
+import asyncio
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from ..parsers.opendota import get_opendota_json
+from ..utils.config import settings
+from ..utils.rate_limit import Priority
+
+SNAPSHOT_PATH = Path(__file__).parent / "data" / "heroes.json"
+
+_heroes: Dict[int, str] = {}
+
+
+def _index_heroes(data: List[Dict]) -> Dict[int, str]:
+    """Строит словарь hero_id -> имя героя из ответа /api/heroes."""
+    return {hero["id"]: hero["localized_name"] for hero in data}
+
+
+def load_heroes_snapshot() -> None:
+    """Загружает каталог героев из файла, поставляемого вместе с ботом."""
+    global _heroes
+
+    try:
+        with open(SNAPSHOT_PATH, encoding="utf-8") as file:
+            _heroes = _index_heroes(json.load(file))
+        logging.info("Каталог героев загружен из снапшота: %s героев", len(_heroes))
+    except (OSError, ValueError, KeyError) as e:
+        logging.error("Не удалось загрузить снапшот героев: %s", e, exc_info=True)
+
+
+async def refresh_heroes() -> bool:
+    """Обновляет каталог героев из OpenDota. Возвращает True при успехе."""
+    global _heroes
+
+    url = "https://api.opendota.com/api/heroes"
+    try:
+        data = await get_opendota_json(url, priority=Priority.BACKGROUND)
+
+        if not data:
+            return False
+
+        _heroes = _index_heroes(data)
+        logging.info("Каталог героев обновлён: %s героев", len(_heroes))
+        return True
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logging.error("Ошибка при обновлении каталога героев: %s", e)
+        return False
+    except (KeyError, TypeError) as e:
+        logging.error("Ошибка при обработке каталога героев: %s", e, exc_info=True)
+        return False
+
+
+async def run_heroes_refresher() -> None:
+    """Фоновая задача: периодически обновляет каталог героев."""
+    while True:
+        await refresh_heroes()
+        await asyncio.sleep(settings.HEROES_REFRESH_TTL)
+
+
+def get_hero_name(hero_id: Optional[int]) -> Optional[str]:
+    """Возвращает имя героя по его ID или None, если герой неизвестен."""
+    if not _heroes:
+        load_heroes_snapshot()
+    return _heroes.get(hero_id)
@@ -0,0 +1,79 @@
+"""Shared HTTP client for OpenDota/DotaBuff"""
+
+import asyncio
+import contextvars
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+import aiohttp
+
+from ..parsers.deadline import remaining_budget, start_deadline, within_budget
+from ..utils.config import settings
+
+_session: Optional[aiohttp.ClientSession] = None
+_in_flight: Dict[Hashable, asyncio.Task] = {}
+
+
+async def start_http_session() -> aiohttp.ClientSession:
+    """Создаёт общую для всех парсеров сессию aiohttp с пулом соединений."""
+    global _session
+
+    if _session is not None and not _session.closed:
+        return _session
+
+    connector = aiohttp.TCPConnector(
+        limit=settings.HTTP_POOL_LIMIT,
+        limit_per_host=settings.HTTP_POOL_LIMIT_PER_HOST,
+        ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=settings.HTTP_TIMEOUT,
+        connect=settings.HTTP_CONNECT_TIMEOUT,
+    )
+    _session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+    logging.info("HTTP-сессия для парсеров создана")
+    return _session
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """Возвращает общую HTTP-сессию, создавая её при первом обращении."""
+    if _session is None or _session.closed:
+        return await start_http_session()
+    return _session
+
+
+async def close_http_session() -> None:
+    """Закрывает общую HTTP-сессию и все открытые соединения."""
+    global _session
+
+    if _session is not None and not _session.closed:
+        await _session.close()
+        logging.info("HTTP-сессия для парсеров закрыта")
+    _session = None
+
+
+def _forget_in_flight(key: Hashable, task: asyncio.Task) -> None:
+    if _in_flight.get(key) is task:
+        del _in_flight[key]
+    if not task.cancelled():
+        task.exception()  # ошибку уже получили ожидающие, не даём asyncio ругаться
+
+
+async def single_flight(key: Hashable, request: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Объединяет одновременные одинаковые запросы: пока запрос с ключом key выполняется,
+    остальные вызовы ждут его и получают тот же результат (его нельзя изменять).
+
+    Общий запрос выполняется со своим полным бюджетом UPDATE_DEADLINE, а не с остатком
+    дедлайна первого вызвавшего; каждый вызов ждёт результат не дольше своего дедлайна.
+    """
+    task = _in_flight.get(key)
+    if task is None:
+        context = contextvars.copy_context()
+        if remaining_budget() is not None:
+            context.run(start_deadline, settings.UPDATE_DEADLINE)
+        task = context.run(asyncio.ensure_future, request())
+        _in_flight[key] = task
+        task.add_done_callback(lambda done: _forget_in_flight(key, done))
+    return await asyncio.wait_for(asyncio.shield(task), within_budget(None))
@@ -1,10 +1,8 @@
-import json
+import asyncio
 import logging
 
-from dataclasses import asdict, dataclass
-from typing import Optional
-
-import aiohttp
+from dataclasses import dataclass
+from typing import Any, Awaitable, Dict, List, Optional
 
 from fluentogram import TranslatorRunner
 
@@ -12,10 +10,12 @@ from ..parsers.account_info import (
     get_rank_account,
     get_info_about_profile,
     get_info_about_wl,
-    get_winrate_last_twenty_matches,
     get_info_about_peers
 )
-from ..parsers.match_info import get_last_match_info, get_name_hero_from_match
+from ..parsers.match_info import build_last_match_info, get_match_data, get_name_hero_from_match
+from ..parsers.stats import get_player_stats
+from ..parsers.deadline import within_budget
+from ..utils.config import settings
 
 
 @dataclass
@@ -29,6 +29,8 @@ class AccountInfo:
     total_matches: Optional[int] = None
     total_winrate: Optional[int] = None
     winrate_last_20_matches: Optional[int] = None
+    winrate_last_100_matches: Optional[int] = None
+    streak: Optional[str] = None
     last_match: Optional[str] = None
     peers: Optional[str] = None
     avatar: Optional[str] = None
@@ -58,60 +60,99 @@ class PlayerMatchInfo:
     tower_damage: Optional[int] = None
 
 
+async def fetch_source(
+    name: str, coro: Awaitable[Any], timeout: float, default: Any = None
+) -> Any:
+    """
+    Ждёт результат одного источника не дольше timeout (и не дольше дедлайна апдейта),
+    иначе возвращает default.
+    """
+    timeout = within_budget(timeout)
+    try:
+        return await asyncio.wait_for(coro, timeout=timeout)
+    except asyncio.TimeoutError:
+        logging.warning("Источник %s не ответил за %s с", name, timeout)
+        return default
+    except Exception as e:
+        logging.error("Ошибка источника %s: %s", name, e, exc_info=True)
+        return default
+
+
+def build_player_match_info(player: Dict, locale: TranslatorRunner) -> PlayerMatchInfo:
+    """Собирает информацию об игроке матча из ответа /matches/{id} без запросов в сеть."""
+
+    player_info = PlayerMatchInfo(
+        account_id=player.get("account_id"),
+        name=player.get("personaname"),
+        hero=get_name_hero_from_match(player.get('hero_id'), locale),
+        team=locale.radiant() if player.get("isRadiant", False) else locale.dire(),
+        lvl=player.get("level", locale.unknown()),
+        networth=player.get("net_worth"),
+        kda=f"{player.get('kills', 0)} | {player.get('deaths', 0)} | {player.get('assists', 0)}",
+        aghanim_scepter=player.get("aghanims_scepter", 0),
+        aghanim_shard=player.get("aghanims_shard", 0),
+        hero_damage=player.get("hero_damage"),
+    )
+
+    benchmarks = player.get("benchmarks")
+
+    if benchmarks:
+        player_info.gold_per_min = benchmarks.get("gold_per_min", {}).get("raw")
+        player_info.hero_damage_per_min = benchmarks.get(
+            "hero_damage_per_min", {}
+        ).get("raw")
+        player_info.hero_healing_per_min = benchmarks.get(
+            "hero_healing_per_min", {}
+        ).get("raw")
+        player_info.kills_per_min = benchmarks.get("kills_per_min", {}).get("raw")
+        player_info.last_hits_per_min = benchmarks.get("last_hits_per_min", {}).get(
+            "raw"
+        )
+        player_info.tower_damage = benchmarks.get("tower_damage", {}).get("raw")
+
+    return player_info
+
+
+async def get_ranks_of_players(
+    account_ids: List[Optional[int]], locale: TranslatorRunner
+) -> List[Optional[str]]:
+    """
+    Параллельно (не более MATCH_RANK_CONCURRENCY запросов) получает ранги игроков.
+    None — аккаунт скрыт или ранг не получен (ошибка или таймаут источника).
+    """
+
+    semaphore = asyncio.Semaphore(settings.MATCH_RANK_CONCURRENCY)
+
+    async def rank_of(account_id: Optional[int]) -> Optional[str]:
+        if account_id is None:  # игрок скрыл аккаунт
+            return None
+        async with semaphore:
+            return await fetch_source(
+                "rank",
+                get_rank_account(account_id, locale),
+                settings.ACCOUNT_SOURCE_TIMEOUT,
+            )
+
+    return await asyncio.gather(*(rank_of(account_id) for account_id in account_ids))
+
+
 async def get_info_about_players_of_match(
     match_id: int, locale: TranslatorRunner
-) -> str:
+) -> List[PlayerMatchInfo]:
     """Возвращает информацию о каждом игроке из заданного матча."""
 
-    url = f"https://api.opendota.com/api/matches/{match_id}"
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as response:
-            data = await response.json()
+    data = await get_match_data(match_id)
 
-    player_info_list = []
     players = data.get("players", [])
+    player_info_list = [build_player_match_info(player, locale) for player in players]
 
-    for player in players:
-        player_info = PlayerMatchInfo(
-            account_id=player.get("account_id"),
-            name=player.get("personaname"),
-            hero=await get_name_hero_from_match(player.get('hero_id'), locale),
-            team=locale.radiant() if player.get("IsRadiant", False) else locale.dire(),
-            rank=await get_rank_account(account_id=player.get("account_id"), locale=locale),
-            lvl=player.get("level", locale.unknown()),
-            networth=player.get("net_worth"),
-            kda=f"{player.get('kills', 0)} | {player.get('deaths', 0)} | {player.get('assists', 0)}",
-            aghanim_scepter=player.get("aghanims_scepter", 0),
-            aghanim_shard=player.get("aghanims_shard", 0),
-            hero_damage=player.get("hero_damage"),
-        )
-
-        benchmarks = player.get("benchmarks")
-
-        if benchmarks:
-            player_info.gold_per_min = benchmarks.get("gold_per_min", {}).get("raw")
-            player_info.hero_damage_per_min = benchmarks.get(
-                "hero_damage_per_min", {}
-            ).get("raw")
-            player_info.hero_healing_per_min = benchmarks.get(
-                "hero_healing_per_min", {}
-            ).get("raw")
-            player_info.kills_per_min = benchmarks.get("kills_per_min", {}).get("raw")
-            player_info.last_hits_per_min = benchmarks.get("last_hits_per_min", {}).get(
-                "raw"
-            )
-            player_info.tower_damage = benchmarks.get("tower_damage", {}).get("raw")
-        else:
-            player_info.gold_per_min = None
-            player_info.hero_damage_per_min = None
-            player_info.hero_healing_per_min = None
-            player_info.kills_per_min = None
-            player_info.last_hits_per_min = None
-            player_info.tower_damage = None
-
-        player_info_list.append(player_info)
+    ranks = await get_ranks_of_players(
+        [player_info.account_id for player_info in player_info_list], locale
+    )
+    for player_info, rank in zip(player_info_list, ranks):
+        player_info.rank = rank
 
-    return json.dumps([asdict(player) for player in player_info_list], indent=4)
+    return player_info_list
 
 
 async def get_info_about_account(
@@ -120,12 +161,20 @@ async def get_info_about_account(
     """Возвращает полную информацию о профиле игрока."""
 
     try:
-        player_data = await get_info_about_profile(account_id)
-        wl_data = await get_info_about_wl(account_id)
-        last_wl_data = await get_winrate_last_twenty_matches(account_id)
-        last_match_info = await get_last_match_info(account_id, locale)
-        rank = await get_rank_account(account_id, locale)
-        peers_info = await get_info_about_peers(account_id)
+        timeout = settings.ACCOUNT_SOURCE_TIMEOUT
+        (
+            player_data,
+            wl_data,
+            stats,
+            rank,
+            peers_info,
+        ) = await asyncio.gather(
+            fetch_source("profile", get_info_about_profile(account_id), timeout),
+            fetch_source("wl", get_info_about_wl(account_id), timeout),
+            fetch_source("stats", get_player_stats(account_id), timeout),
+            fetch_source("rank", get_rank_account(account_id, locale), timeout),
+            fetch_source("peers", get_info_about_peers(account_id), timeout),
+        )
 
         if player_data is None or wl_data is None:
             return None
@@ -137,15 +186,29 @@ async def get_info_about_account(
         except ZeroDivisionError:
             total_winrate = 0
 
-        try:
-            winrate_last_20_matches = round(last_wl_data["win"] / (last_wl_data["win"] + last_wl_data["lose"])* 100, 2)
-        except ZeroDivisionError:
-            winrate_last_20_matches = 0
+        if stats:
+            winrate_last_20_matches = f"{stats.winrates[20]:.2f}"
+            winrate_last_100_matches = f"{stats.winrates[100]:.2f}"
+            if stats.streak > 0:
+                streak = f"🔺{stats.streak}"
+            elif stats.streak < 0:
+                streak = f"🔻{-stats.streak}"
+            else:
+                streak = "0"
+        else:
+            winrate_last_20_matches = locale.unknown()
+            winrate_last_100_matches = locale.unknown()
+            streak = locale.unknown()
 
         total_matches = wl_data["win"] + wl_data["lose"]
+        last_match_info = (
+            build_last_match_info(stats.last_match, locale)
+            if stats and stats.last_match
+            else []
+        )
         if last_match_info:
             last_match = (
-                f'\n{locale.hero()} `{last_match_info[1]['hero_name']}`'
+                f'\n{locale.hero()} `{last_match_info[1]["hero_name"]}`'
                 f'\n{locale.kda()} `{last_match_info[1]["kills"]}` \\| '
                 f'`{last_match_info[1]["deaths"]}` \\| '
                 f'`{last_match_info[1]["assists"]}`\n'
@@ -167,12 +230,14 @@ async def get_info_about_account(
         profile = player_data.get("profile", {})
 
         account_info.name = profile.get("personaname")
-        account_info.rank = rank
+        account_info.rank = rank or locale.unknown()
         account_info.wins = wl_data.get("win")
         account_info.losses = wl_data.get("lose")
         account_info.total_matches = total_matches
         account_info.total_winrate = f"{total_winrate:.2f}"
-        account_info.winrate_last_20_matches = f"{winrate_last_20_matches:.2f}"
+        account_info.winrate_last_20_matches = winrate_last_20_matches
+        account_info.winrate_last_100_matches = winrate_last_100_matches
+        account_info.streak = streak
         account_info.last_match = last_match
         account_info.peers = peers
         account_info.avatar = profile.get("avatarfull")
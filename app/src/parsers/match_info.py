@@ -1,21 +1,97 @@
 """Parsing info about match"""
 
+import asyncio
 import logging
 from typing import Dict, List, Optional, Union
 
 import aiohttp
 from fluentogram import TranslatorRunner
 
+from ..parsers.http_client import single_flight
+from ..parsers.opendota import get_opendota_json
+from ..parsers.heroes import get_hero_name
+from ..database.requests import archive_match, get_archived_match
+
+MATCH_FIELDS = ("match_id", "radiant_win", "human_players", "game_mode", "lobby_type")
+
+PLAYER_FIELDS = (
+    "account_id",
+    "personaname",
+    "hero_id",
+    "isRadiant",
+    "level",
+    "net_worth",
+    "kills",
+    "deaths",
+    "assists",
+    "aghanims_scepter",
+    "aghanims_shard",
+    "hero_damage",
+    "abandons",
+)
+
+BENCHMARK_FIELDS = (
+    "gold_per_min",
+    "hero_damage_per_min",
+    "hero_healing_per_min",
+    "kills_per_min",
+    "last_hits_per_min",
+    "tower_damage",
+)
+
+
+def normalize_match(data: Dict) -> Dict:
+    """Оставляет из ответа /matches/{id} только поля, которые использует бот."""
+
+    players = []
+    for player in data.get("players", []):
+        normalized = {field: player[field] for field in PLAYER_FIELDS if field in player}
+        benchmarks = player.get("benchmarks")
+        if benchmarks:
+            normalized["benchmarks"] = {
+                field: {"raw": benchmarks[field].get("raw")}
+                for field in BENCHMARK_FIELDS
+                if field in benchmarks
+            }
+        players.append(normalized)
+
+    match = {field: data[field] for field in MATCH_FIELDS if field in data}
+    match["players"] = players
+    return match
+
+
+async def get_match_data(match_id: int) -> Dict:
+    """Возвращает данные матча из архива, а при их отсутствии — из OpenDota."""
+
+    return await single_flight(("match", match_id), lambda: _load_match_data(match_id))
+
+
+async def _load_match_data(match_id: int) -> Dict:
+    archived = await get_archived_match(match_id)
+    if archived is not None:
+        return archived
+
+    url = f"https://api.opendota.com/api/matches/{match_id}"
+    try:
+        data = await get_opendota_json(url)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logging.error("Ошибка при запросе матча %s: %s", match_id, e)
+        return {}
+
+    if not data.get("players"):
+        return data  # матч ещё не завершён — не сохраняем
+
+    match = normalize_match(data)
+    await archive_match(match_id, match)
+    return match
+
 
 async def get_general_info_about_match(
     match_id: int, locale: TranslatorRunner
 ) -> Dict[str, str]:
     """Возвращает общую информацию о матче."""
 
-    url = f"https://api.opendota.com/api/matches/{match_id}"
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as response:
-            data = await response.json()
+    data = await get_match_data(match_id)
 
     radiant_win = data.get("radiant_win", False)
     human_players = data.get("human_players", 0)
@@ -53,23 +129,13 @@ async def get_general_info_about_match(
     
 
 
-async def get_last_match_info(
-    account_id: int, locale: TranslatorRunner
+def build_last_match_info(
+    match_data: Dict, locale: TranslatorRunner
 ) -> List[Union[Optional[str], Dict[str, str]]]:
-    """Возвращает информацию об игроке в последнем его матче."""
+    """Возвращает информацию об игроке в матче из ответа /players/{id}/matches."""
 
-    url = f"https://api.opendota.com/api/players/{account_id}/matches"
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params={"limit": 1}) as response:
-                response.raise_for_status()
-                data = await response.json()
-
-        if not data:
-            return []
-
-        match_data = data[0]
-        hero = await get_name_hero_from_match(match_data['hero_id'], locale)
+        hero = get_name_hero_from_match(match_data['hero_id'], locale)
         return [
             str(match_data["match_id"]),
             {
@@ -80,43 +146,14 @@ async def get_last_match_info(
             },
             locale.radiant() if match_data["radiant_win"] else locale.dire(),
         ]
-    except aiohttp.ClientError as e:
-        logging.error(
-            "Ошибка при запросе к API (get_last_match_info): %e", e, exc_info=True
-        )
-        return []
     except (KeyError, TypeError) as e:
         logging.error(
-            "Ошибка при обработке данных (get_last_match_info): %e", e, exc_info=True
+            "Ошибка при обработке данных (build_last_match_info): %s", e, exc_info=True
         )
         return []
-    except Exception as e:
-        logging.error("Неизвестная ошибка (get_last_match_info): %e", e, exc_info=True)
-        return []
 
 
-async def get_name_hero_from_match(hero_id: int, locale: TranslatorRunner) -> str:
+def get_name_hero_from_match(hero_id: int, locale: TranslatorRunner) -> str:
     """Возвращает имя героя по его ID"""
 
-    url = f"https://api.opendota.com/api/heroes"
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                data = await response.json()
-
-        if not data:
-            return locale.unknown()
-
-        return data[hero_id - 2]['localized_name'] # Чтобы найти нужный id нужно отнять -2 у hero_id (p.s. ох уж это api opendota...)
-    except aiohttp.ClientError as e:
-        logging.error(
-            "Ошибка при запросе к API (get_name_hero_from_match): %e", e, exc_info=True
-        )
-        return []
-    except (KeyError, TypeError) as e:
-        logging.error("Ошибка при обработке данных (get_name_hero_from_match): %e", e, exc_info=True)
-        return []
-    except Exception as e:
-        logging.error("Неизвестная ошибка (get_name_hero_from_match): %e", e, exc_info=True)
-        return []
+    return get_hero_name(hero_id) or locale.unknown()
@@ -0,0 +1,35 @@
+"""Rate-limited access to the OpenDota API"""
+
+import asyncio
+from typing import Any, Dict, Optional
+
+from ..parsers.deadline import get_request_timeout, within_budget
+from ..parsers.http_client import get_http_session, single_flight
+from ..utils.config import settings
+from ..utils.rate_limit import Priority, RequestScheduler
+
+scheduler = RequestScheduler(settings.OPENDOTA_RATE_LIMIT, settings.OPENDOTA_BURST)
+
+
+async def get_opendota_json(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> Any:
+    """
+    Выполняет GET к OpenDota с учётом лимита запросов и возвращает JSON.
+    Одновременные запросы с одинаковыми url и params выполняются один раз.
+    """
+    key = ("opendota", url, tuple(sorted((params or {}).items())))
+    return await single_flight(key, lambda: _request_json(url, params, priority))
+
+
+async def _request_json(
+    url: str, params: Optional[Dict[str, Any]], priority: Priority
+) -> Any:
+    await asyncio.wait_for(scheduler.acquire(priority), within_budget(None))
+
+    session = await get_http_session()
+    async with session.get(url, params=params, timeout=get_request_timeout()) as response:
+        response.raise_for_status()
+        return await response.json()
@@ -0,0 +1,63 @@
+"""Player statistics from a single recent matches payload"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from ..parsers.account_info import get_recent_matches
+
+WINRATE_WINDOWS = (20, 50, 100)
+
+
+@dataclass
+class PlayerStats:
+    winrates: Dict[int, float] = field(default_factory=dict)
+    streak: int = 0  # > 0 — серия побед, < 0 — серия поражений
+    last_match: Optional[Dict] = None
+
+
+def is_win(match: Dict) -> bool:
+    """Проверяет, победил ли игрок в матче (слоты 0-127 — Radiant)."""
+    return (match["player_slot"] < 128) == match["radiant_win"]
+
+
+def calculate_winrate(matches: Sequence[Dict]) -> float:
+    """Возвращает процент побед в переданных матчах."""
+    if not matches:
+        return 0
+    wins = sum(1 for match in matches if is_win(match))
+    return round(wins / len(matches) * 100, 2)
+
+
+def calculate_streak(matches: Sequence[Dict]) -> int:
+    """Возвращает текущую серию побед (> 0) или поражений (< 0)."""
+    if not matches:
+        return 0
+
+    last_result = is_win(matches[0])
+    streak = 0
+    for match in matches:
+        if is_win(match) != last_result:
+            break
+        streak += 1
+    return streak if last_result else -streak
+
+
+def build_player_stats(
+    matches: List[Dict], windows: Sequence[int] = WINRATE_WINDOWS
+) -> PlayerStats:
+    """Считает винрейт по окнам, серию и последний матч из списка матчей (новые первыми)."""
+    return PlayerStats(
+        winrates={window: calculate_winrate(matches[:window]) for window in windows},
+        streak=calculate_streak(matches),
+        last_match=matches[0] if matches else None,
+    )
+
+
+async def get_player_stats(
+    account_id: int, windows: Sequence[int] = WINRATE_WINDOWS
+) -> Optional[PlayerStats]:
+    """Одним запросом получает последние матчи игрока и считает по ним статистику."""
+    matches = await get_recent_matches(account_id, max(windows))
+    if matches is None:
+        return None
+    return build_player_stats(matches, windows)
@@ -0,0 +1,235 @@
+"""Broadcast engine for /sendall"""
+
+import asyncio
+import logging
+import time
+from typing import Optional, Set
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+from redis.exceptions import RedisError
+
+from ..database.models import BroadcastJob
+from ..database.requests import (
+    count_users,
+    create_broadcast,
+    get_unfinished_broadcast,
+    get_user_ids_page,
+    save_broadcast_progress,
+)
+from .config import settings
+from .rate_limit import RequestScheduler
+from .storage import get_redis
+
+MAX_SEND_ATTEMPTS = 3
+BROADCAST_LOCK_TTL = 30  # с запасом на проверку и создание записи, если воркер упадёт
+
+_running: Set[asyncio.Task] = set()
+_start_lock = asyncio.Lock()
+
+
+class BroadcastEngine:
+    """
+    Рассылает сообщение всем пользователям пулом воркеров с общим лимитом
+    сообщений в секунду. Получатели читаются из БД страницами, после каждой
+    страницы прогресс сохраняется, поэтому после падения рассылка продолжается
+    с места остановки (повторно может уйти не более одной страницы).
+    """
+
+    def __init__(self, bot: Bot, job: BroadcastJob) -> None:
+        self.bot = bot
+        self.job = job
+        self.sent = job.sent
+        self.failed = job.failed
+        self.last_user_id = job.last_user_id
+        self.total = 0
+        self._limiter = RequestScheduler(
+            rate_per_minute=settings.BROADCAST_MESSAGES_PER_SECOND * 60,
+            burst=settings.BROADCAST_MESSAGES_PER_SECOND,
+        )
+        self._resume_at = 0.0  # до этого момента Telegram просит не отправлять
+        self._progress_message_id: Optional[int] = None
+        self._last_report = 0.0
+
+    async def _send(self, tg_id: int) -> bool:
+        """Отправляет сообщение одному пользователю, соблюдая RetryAfter"""
+        for _ in range(MAX_SEND_ATTEMPTS):
+            delay = self._resume_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self._limiter.acquire()
+
+            try:
+                await self.bot.send_message(
+                    chat_id=tg_id,
+                    text=f"Вам было отправлено сообщение: \n\n{self.job.text}",
+                    parse_mode="HTML",
+                )
+                return True
+            except TelegramRetryAfter as e:
+                logging.warning("Telegram просит подождать %s с во время рассылки", e.retry_after)
+                self._resume_at = max(self._resume_at, time.monotonic() + e.retry_after)
+            except Exception as e:
+                logging.error(f"Возникла ошибка при отправке рассылке сообщения пользователю {tg_id}: {e}")
+                return False
+        return False
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            tg_id = await queue.get()
+            try:
+                if await self._send(tg_id):
+                    self.sent += 1
+                else:
+                    self.failed += 1
+            finally:
+                queue.task_done()
+
+    def _progress_text(self) -> str:
+        return (
+            f"Рассылка \\#{self.job.id}: обработано {self.sent + self.failed} из {self.total}\\.\n"
+            f"Успешно: {self.sent}\nПровально: {self.failed}"
+        )
+
+    async def _report_progress(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_report < settings.BROADCAST_PROGRESS_INTERVAL:
+            return
+        self._last_report = now
+
+        try:
+            if self._progress_message_id is None:
+                message = await self.bot.send_message(self.job.chat_id, self._progress_text())
+                self._progress_message_id = message.message_id
+            else:
+                await self.bot.edit_message_text(
+                    self._progress_text(),
+                    chat_id=self.job.chat_id,
+                    message_id=self._progress_message_id,
+                )
+        except TelegramBadRequest as e:  # например, текст не изменился
+            logging.debug("Не удалось обновить прогресс рассылки: %s", e)
+        except Exception as e:
+            logging.error("Ошибка при отправке прогресса рассылки: %s", e)
+
+    async def run(self) -> None:
+        self.total = await count_users()
+        await self._report_progress(force=True)
+
+        queue: asyncio.Queue = asyncio.Queue()
+        workers = [
+            asyncio.create_task(self._worker(queue))
+            for _ in range(settings.BROADCAST_WORKERS)
+        ]
+        try:
+            while True:
+                page = await get_user_ids_page(self.last_user_id, settings.BROADCAST_PAGE_SIZE)
+                if not page:
+                    break
+
+                for _, tg_id in page:
+                    queue.put_nowait(tg_id)
+                await queue.join()
+
+                self.last_user_id = page[-1][0]
+                await save_broadcast_progress(self.job.id, self.last_user_id, self.sent, self.failed)
+                await self._report_progress()
+
+            await save_broadcast_progress(
+                self.job.id, self.last_user_id, self.sent, self.failed, finished=True
+            )
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+        await self._report_progress(force=True)
+        await self.bot.send_message(
+            self.job.chat_id,
+            f"Рассылка завершена\\. \nИз {self.sent + self.failed} пользователей сообщение отправлено: "
+            f"\nУспешно: {self.sent}\nПровально: {self.failed}",
+        )
+
+
+async def _run_broadcast(bot: Bot, job: BroadcastJob) -> None:
+    engine = BroadcastEngine(bot, job)
+    try:
+        await engine.run()
+    except asyncio.CancelledError:
+        logging.info("Рассылка %s прервана, продолжится после перезапуска", job.id)
+        raise
+    except Exception as e:
+        logging.error("Ошибка во время рассылки %s: %s", job.id, e, exc_info=True)
+        await _fail_broadcast(engine)
+
+
+async def _fail_broadcast(engine: BroadcastEngine) -> None:
+    """
+    Закрывает упавшую рассылку: незавершённая запись считается идущей рассылкой
+    и блокировала бы новые до перезапуска бота.
+    """
+    job = engine.job
+    try:
+        await save_broadcast_progress(
+            job.id, engine.last_user_id, engine.sent, engine.failed, finished=True
+        )
+    except Exception as e:
+        logging.error("Не удалось закрыть рассылку %s: %s", job.id, e, exc_info=True)
+
+    try:
+        await engine.bot.send_message(
+            job.chat_id,
+            f"Рассылка \\#{job.id} остановлена из\\-за ошибки\\. \nУспешно: {engine.sent}\nПровально: {engine.failed}",
+        )
+    except Exception as e:
+        logging.error("Ошибка при отправке отчёта о рассылке %s: %s", job.id, e)
+
+
+async def start_new_broadcast(bot: Bot, text: str, chat_id: int) -> Optional[BroadcastJob]:
+    """
+    Создаёт и запускает рассылку, если никакая другая не идёт ни в одном воркере.
+    Признак идущей рассылки — незавершённая запись BroadcastJob в общей БД; чтобы два
+    админа не создали записи одновременно, проверка и создание идут под блокировкой
+    (Redis, если настроен, и внутри процесса). Возвращает None, если рассылка уже идёт.
+    """
+    async with _start_lock:
+        redis = get_redis()
+        if redis is not None and not await redis.set(
+            settings.REDIS_BROADCAST_LOCK, 1, nx=True, ex=BROADCAST_LOCK_TTL
+        ):
+            return None
+
+        try:
+            if _running or await get_unfinished_broadcast() is not None:
+                return None
+            job = await create_broadcast(text, chat_id)
+        finally:
+            if redis is not None:
+                try:
+                    await redis.delete(settings.REDIS_BROADCAST_LOCK)
+                except RedisError as e:  # блокировка истечёт сама через BROADCAST_LOCK_TTL
+                    logging.warning("Не удалось снять блокировку рассылки: %s", e)
+
+    start_broadcast(bot, job)
+    return job
+
+
+def start_broadcast(bot: Bot, job: BroadcastJob) -> asyncio.Task:
+    """Запускает рассылку в фоне, не блокируя обработку апдейтов"""
+    task = asyncio.create_task(_run_broadcast(bot, job))
+    _running.add(task)
+    task.add_done_callback(_running.discard)
+    return task
+
+
+async def resume_unfinished_broadcast(bot: Bot) -> None:
+    """Продолжает рассылку, прерванную остановкой или падением бота"""
+    job = await get_unfinished_broadcast()
+    if job is not None:
+        logging.info("Продолжаю рассылку %s с пользователя id > %s", job.id, job.last_user_id)
+        start_broadcast(bot, job)
+
+
+async def stop_broadcasts() -> None:
+    for task in list(_running):
+        task.cancel()
+    await asyncio.gather(*_running, return_exceptions=True)
@@ -6,13 +6,74 @@ load_dotenv()
 
 class Settings(BaseSettings):
     BOT_TOKEN: str
-    DB_USER: str
-    DB_NAME: str
-    DB_HOST: str
-    DB_PORT: str
-    DB_PASSWORD: str
+    DB_NAME: str  # для sqlite+aiosqlite — путь к файлу БД
+    DB_USER: str = ""
+    DB_HOST: str = ""
+    DB_PORT: str = ""
+    DB_PASSWORD: str = ""
     ADMINS: int
 
+    DB_DRIVER: str = "mysql+aiomysql"  # или "sqlite+aiosqlite" для локального запуска
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE: int = 3600  # MySQL закрывает простаивающие соединения (wait_timeout)
+    DB_POOL_PRE_PING: bool = True
+
+    HTTP_POOL_LIMIT: int = 100
+    HTTP_POOL_LIMIT_PER_HOST: int = 20
+    HTTP_DNS_CACHE_TTL: int = 300
+    HTTP_KEEPALIVE_TIMEOUT: float = 30
+    HTTP_TIMEOUT: float = 10
+    HTTP_CONNECT_TIMEOUT: float = 3
+
+    OPENDOTA_RATE_LIMIT: int = 60  # запросов в минуту
+    OPENDOTA_BURST: int = 10
+
+    UPDATE_DEADLINE: float = 8  # секунд на ответ пользователю
+
+    USER_CACHE_SIZE: int = 100_000
+    USER_CACHE_TTL: int = 60 * 60
+    REQUEST_COUNTS_FLUSH_INTERVAL: float = 10
+
+    BROADCAST_MESSAGES_PER_SECOND: int = 25
+    BROADCAST_WORKERS: int = 10
+    BROADCAST_PAGE_SIZE: int = 500
+    BROADCAST_PROGRESS_INTERVAL: float = 5
+
+    HEROES_REFRESH_TTL: int = 24 * 60 * 60
+    ACCOUNT_SOURCE_TIMEOUT: float = 4
+    MATCH_RANK_CONCURRENCY: int = 5
+    MATCH_ARCHIVE_MAX_MATCHES: int = 100_000
+    MATCH_ARCHIVE_PRUNE_EVERY: int = 1_000  # очищать архив раз в N сохранённых матчей
+
+    RANK_CACHE_SIZE: int = 50_000
+    RANK_CACHE_TTL: int = 6 * 60 * 60
+    RANK_MISSING_CACHE_TTL: int = 30 * 60
+
+    MATCH_VIEW_CACHE_SIZE: int = 1_000
+    MATCH_VIEW_CACHE_TTL: int = 60 * 60
+
+    BOT_MODE: str = "polling"  # polling — для разработки, webhook — для продакшена
+    WEBHOOK_BASE_URL: str = ""  # публичный адрес, например https://bot.example.com
+    WEBHOOK_PATH: str = "/webhook"
+    WEBHOOK_SECRET: str = ""
+    WEB_HOST: str = "0.0.0.0"
+    WEB_PORT: int = 8080
+    WEB_WORKERS: int = 1
+
+    REDIS_URL: str = ""  # пусто — FSM и троттлинг хранятся в памяти процесса
+    REDIS_FSM_PREFIX: str = "fsm"
+    REDIS_THROTTLE_PREFIX: str = "throttle"
+    REDIS_LANGUAGE_PREFIX: str = "language"
+    REDIS_BROADCAST_LOCK: str = "broadcast:lock"
+    FSM_STATE_TTL: int = 24 * 60 * 60
+    FSM_DATA_TTL: int = 24 * 60 * 60
+
+    THROTTLE_RATE: float = 1  # апдейтов в секунду на пользователя
+    THROTTLE_BURST: int = 3
+    THROTTLE_MAX_WAIT: float = 2  # сколько апдейт может ждать токен, прежде чем его отбросят
+
     model_config = SettingsConfigDict()  # ../../../.env
 
 
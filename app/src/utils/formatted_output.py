@@ -32,6 +32,11 @@ LOBBY_TYPE = {
     0: "Normal"
 }
 
+def _or_unknown(value, locale: TranslatorRunner, spec: str = "") -> str:
+    """Форматирует значение, подставляя «неизвестно» вместо отсутствующего."""
+    return locale.unknown() if value is None else format(value, spec)
+
+
 def format_player_info_in_match(
     players: List[Dict[str, any]], player_index: int, locale: TranslatorRunner
 ) -> str:
@@ -41,25 +46,25 @@ def format_player_info_in_match(
 
     player = players[player_index]
     answer = (
-        f"{locale.name()} `{player['name']}`\n"
-        f"{locale.hero()} `{player['hero']}`\n"
-        f"{locale.account_id()} `{player['account_id']}`\n"
+        f"{locale.name()} `{_or_unknown(player['name'], locale)}`\n"
+        f"{locale.hero()} `{_or_unknown(player['hero'], locale)}`\n"
+        f"{locale.account_id()} `{_or_unknown(player['account_id'], locale)}`\n"
         f"{locale.team()} `{player['team']}`\n"
-        f"{locale.rank()} `{player['rank']}`\n"
+        f"{locale.rank()} `{_or_unknown(player['rank'], locale)}`\n"
         f"{locale.kda()} `{player['kda']}`\n"
         f"{locale.lvl()} `{player['lvl']}`\n"
-        f"{locale.aghanim_scepter()} {locale.yes_emoji() if player['aghanim_scepter'] > 0 else locale.no_emoji()}\n"
-        f"{locale.aghanim_shard()} {locale.yes_emoji() if player['aghanim_shard'] > 0 else locale.no_emoji()}\n"
-        f"{locale.networth()} `{player['networth']}`\n"
-        f"{locale.gold_per_min()} `{player['gold_per_min']:.0f}`\n"
-        f"{locale.enemy_damage()} `{player['hero_damage']:.0f}`\n"
-        f"{locale.enemy_damage_per_min()} `{player['hero_damage_per_min']:.0f}`\n"
-        f"{locale.last_hits_per_min()} `{player['last_hits_per_min']:.0f}`\n"
-        f"{locale.hero_healing_per_min()} `{player['hero_healing_per_min']:.0f}`\n"
-        f"{locale.tower_damage()} `{player['tower_damage']}`"
+        f"{locale.aghanim_scepter()} {locale.yes_emoji() if player['aghanim_scepter'] else locale.no_emoji()}\n"
+        f"{locale.aghanim_shard()} {locale.yes_emoji() if player['aghanim_shard'] else locale.no_emoji()}\n"
+        f"{locale.networth()} `{_or_unknown(player['networth'], locale)}`\n"
+        f"{locale.gold_per_min()} `{_or_unknown(player['gold_per_min'], locale, '.0f')}`\n"
+        f"{locale.enemy_damage()} `{_or_unknown(player['hero_damage'], locale, '.0f')}`\n"
+        f"{locale.enemy_damage_per_min()} `{_or_unknown(player['hero_damage_per_min'], locale, '.0f')}`\n"
+        f"{locale.last_hits_per_min()} `{_or_unknown(player['last_hits_per_min'], locale, '.0f')}`\n"
+        f"{locale.hero_healing_per_min()} `{_or_unknown(player['hero_healing_per_min'], locale, '.0f')}`\n"
+        f"{locale.tower_damage()} `{_or_unknown(player['tower_damage'], locale)}`"
     )
 
-    if answer.count("None") > 0:
+    if player['account_id'] is None:
         answer += f"\n\n{locale.probably_account_hidden()}"
 
     return answer
@@ -84,6 +89,8 @@ def format_account_info(account: AccountInfo, locale: TranslatorRunner):
         f"{locale.rank()} `{account.rank}`\n"
         f"{locale.number_matches()} `{account.total_matches}` \\| 🔺`{account.wins} `🔻`{account.losses}`\n"
         f"{locale.wr_last_20_matches()} `{account.winrate_last_20_matches}%`\n"
+        f"{locale.wr_last_100_matches()} `{account.winrate_last_100_matches}%`\n"
+        f"{locale.streak()} `{account.streak}`\n"
         f"{locale.has_dplus_now()} {locale.yes_emoji() if account.has_dplus_now else locale.no_emoji()}\n"
         f"{locale.country()} `{account.location}`\n"
         f"{locale.account_id()} `{account.account_id}`\n"
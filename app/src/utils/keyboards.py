@@ -2,7 +2,7 @@
 
 import logging
 
-from typing import Dict
+from typing import Callable, Dict, List, Tuple
 
 from aiogram.types import (
     InlineKeyboardButton,
@@ -14,13 +14,66 @@ from aiogram.types import (
 from aiogram.utils.keyboard import InlineKeyboardBuilder, ReplyKeyboardBuilder
 from aiogram.filters import callback_data
 
-from fluentogram import TranslatorRunner
+from cachetools import LRUCache
+from fluentogram import TranslatorHub, TranslatorRunner
+
+from .translations import LOCALES, get_locale_name
 
 delete_kb = ReplyKeyboardRemove()
 
+LANGUAGE_KEYBOARD = InlineKeyboardMarkup(
+    inline_keyboard=[
+        [
+            InlineKeyboardButton(text="Русский", callback_data="select_ru"),
+            InlineKeyboardButton(text="English", callback_data="select_en"),
+        ]
+    ]
+)
+
+CONFIRM_KEYBOARD = InlineKeyboardMarkup(
+    inline_keyboard=[
+        [
+            InlineKeyboardButton(text="Подтверждаю ✅", callback_data="confirm"),
+            InlineKeyboardButton(text="Отменить ❌", callback_data="cancel"),
+        ]
+    ]
+)
+
+# Клавиатуры ниже общие для всех пользователей одного языка — их нельзя изменять
+_static_keyboards: Dict[Tuple[str, str], InlineKeyboardMarkup] = {}
+_paginated_keyboards = LRUCache(maxsize=1_000)
+_carousel_navigation = LRUCache(maxsize=1_000)
+
+
+def _static_keyboard(
+    name: str, locale: TranslatorRunner, build: Callable[[TranslatorRunner], InlineKeyboardMarkup]
+) -> InlineKeyboardMarkup:
+    """Возвращает клавиатуру name для языка locale, создавая её один раз."""
+    key = (name, get_locale_name(locale))
+    keyboard = _static_keyboards.get(key)
+    if keyboard is None:
+        keyboard = _static_keyboards[key] = build(locale)
+    return keyboard
+
+
+def _back_button(locale: TranslatorRunner) -> InlineKeyboardButton:
+    return _static_keyboard("back", locale, _build_back_keyboard).inline_keyboard[0][0]
+
 
 async def paginated_buttons(
     page: int, number_of_page: int, locale: TranslatorRunner
+) -> InlineKeyboardMarkup:
+    key = (get_locale_name(locale), page, number_of_page)
+    keyboard = _paginated_keyboards.get(key)
+    if keyboard is None:
+        keyboard = _paginated_keyboards[key] = _build_paginated_buttons(
+            page, number_of_page, locale
+        )
+    return keyboard
+
+
+def _build_paginated_buttons(
+    page: int, number_of_page: int, locale: TranslatorRunner
 ) -> InlineKeyboardMarkup:
     try:
         keyboard = InlineKeyboardBuilder()
@@ -49,7 +102,7 @@ async def paginated_buttons(
             )
         )
 
-        keyboard.row(InlineKeyboardButton(text=locale.back(), callback_data="back"))
+        keyboard.row(_back_button(locale))
         return keyboard.as_markup()
 
     except Exception as e:
@@ -67,45 +120,60 @@ async def account_buttons(
         end_index = start_index + accounts_per_page
 
         accounts_on_page = dict(accounts[start_index:end_index])
-        number_of_pages = (len(accounts) + accounts_per_page - 1) // accounts_per_page
 
-        keyboard = InlineKeyboardBuilder()
-        for account_id, name in accounts_on_page.items():
-            keyboard.row(
-                InlineKeyboardButton(
-                    text=name, callback_data=f"account_id:{account_id}"
-                )
+        account_rows = [
+            [InlineKeyboardButton(text=name, callback_data=f"account_id:{account_id}")]
+            for account_id, name in accounts_on_page.items()
+        ]
+
+        key = (get_locale_name(locale), page, len(accounts))
+        navigation_rows = _carousel_navigation.get(key)
+        if navigation_rows is None:
+            navigation_rows = _carousel_navigation[key] = _build_carousel_navigation(
+                page, len(accounts), accounts_per_page, locale
             )
 
-        previous_page = page > 0
-        next_page = end_index < len(accounts) - 1
+        return InlineKeyboardMarkup(inline_keyboard=account_rows + navigation_rows)
+    except Exception as e:
+        logging.error("Ошибка при создании кнопок аккаунтов: %s", e, exc_info=True)
+        raise e
 
-        navigation_buttons = []
 
-        if previous_page:
-            navigation_buttons.append(
-                InlineKeyboardButton(text="<<", callback_data=f"carousel:{page - 1}")
-            )
+def _build_carousel_navigation(
+    page: int, number_of_accounts: int, accounts_per_page: int, locale: TranslatorRunner
+) -> List[List[InlineKeyboardButton]]:
+    """Ряды под списком аккаунтов: номер страницы, навигация и «назад»."""
+    end_index = (page + 1) * accounts_per_page
+    number_of_pages = (number_of_accounts + accounts_per_page - 1) // accounts_per_page
 
-        if next_page:
-            navigation_buttons.append(
-                InlineKeyboardButton(text=">>", callback_data=f"carousel:{page + 1}")
-            )
+    previous_page = page > 0
+    next_page = end_index < number_of_accounts - 1
 
-        keyboard.row(
+    navigation_buttons = []
+
+    if previous_page:
+        navigation_buttons.append(
+            InlineKeyboardButton(text="<<", callback_data=f"carousel:{page - 1}")
+        )
+
+    if next_page:
+        navigation_buttons.append(
+            InlineKeyboardButton(text=">>", callback_data=f"carousel:{page + 1}")
+        )
+
+    rows = [
+        [
             InlineKeyboardButton(
                 text=f"{page + 1}/{number_of_pages}", callback_data="dummy_action"
             )
-        )
+        ]
+    ]
 
-        if navigation_buttons:
-            keyboard.row(*navigation_buttons)
+    if navigation_buttons:
+        rows.append(navigation_buttons)
 
-        keyboard.row(InlineKeyboardButton(text=locale.back(), callback_data="back"))
-        return keyboard.as_markup()
-    except Exception as e:
-        logging.error("Ошибка при создании кнопок аккаунтов: %s", e, exc_info=True)
-        raise e
+    rows.append([_back_button(locale)])
+    return rows
 
 
 async def get_inline_buttons(
@@ -126,15 +194,39 @@ async def special_button_for_account(
 
     steam_button = InlineKeyboardButton(text="Steam profile", url=url)
 
-    back_button = InlineKeyboardButton(text=locale.back(), callback_data="back")
-
     keyboard.add(steam_button)
-    keyboard.add(back_button)
+    keyboard.add(_back_button(locale))
 
     return keyboard.adjust(1).as_markup()
 
 
+async def get_back_keyboard(locale: TranslatorRunner) -> InlineKeyboardMarkup:
+    return _static_keyboard("back", locale, _build_back_keyboard)
+
+
+def _build_back_keyboard(locale: TranslatorRunner) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(
+        inline_keyboard=[[InlineKeyboardButton(text=locale.back(), callback_data="back")]]
+    )
+
+
+async def get_language_keyboard() -> InlineKeyboardMarkup:
+    return LANGUAGE_KEYBOARD
+
+
+async def get_confirm_keyboard() -> InlineKeyboardMarkup:
+    return CONFIRM_KEYBOARD
+
+
 async def get_start_keyboard_page_1(locale: TranslatorRunner) -> InlineKeyboardMarkup:
+    return _static_keyboard("start_page_1", locale, _build_start_keyboard_page_1)
+
+
+async def get_start_keyboard_page_2(locale: TranslatorRunner) -> InlineKeyboardMarkup:
+    return _static_keyboard("start_page_2", locale, _build_start_keyboard_page_2)
+
+
+def _build_start_keyboard_page_1(locale: TranslatorRunner) -> InlineKeyboardMarkup:
     keyboard = InlineKeyboardMarkup(
         inline_keyboard=[
             [
@@ -169,7 +261,7 @@ async def get_start_keyboard_page_1(locale: TranslatorRunner) -> InlineKeyboardM
     return keyboard
 
 
-async def get_start_keyboard_page_2(locale: TranslatorRunner) -> InlineKeyboardMarkup:
+def _build_start_keyboard_page_2(locale: TranslatorRunner) -> InlineKeyboardMarkup:
     keyboard = InlineKeyboardMarkup(
         inline_keyboard=[
             [InlineKeyboardButton(text="Language 💬", callback_data="change_language")],
@@ -202,6 +294,15 @@ async def get_start_keyboard_page_2(locale: TranslatorRunner) -> InlineKeyboardM
     return keyboard
 
 
+async def prebuild_keyboards(t_hub: TranslatorHub) -> None:
+    """Создаёт статичные клавиатуры для всех языков при запуске бота."""
+    for language in LOCALES:
+        locale = t_hub.get_translator_by_locale(language)
+        await get_start_keyboard_page_1(locale)
+        await get_start_keyboard_page_2(locale)
+        await get_back_keyboard(locale)
+
+
 async def get_reply_buttons(
     *btns: str,
     placeholder: str = None,
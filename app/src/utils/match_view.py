@@ -0,0 +1,73 @@
+"""Shared per-match view snapshots for player pagination"""
+
+import logging
+from dataclasses import asdict, dataclass
+from typing import Optional, Tuple
+
+from cachetools import TTLCache
+from fluentogram import TranslatorRunner
+
+from ..parsers.http_client import single_flight
+from ..parsers.info import get_info_about_players_of_match
+from .config import settings
+from .formatted_output import format_player_info_in_match
+from .translations import get_locale_name
+
+
+@dataclass(frozen=True)
+class MatchPlayersView:
+    """Готовые страницы с информацией об игроках матча (одна страница — один игрок)."""
+
+    match_id: int
+    pages: Tuple[str, ...]
+
+
+_match_views = TTLCache(
+    maxsize=settings.MATCH_VIEW_CACHE_SIZE, ttl=settings.MATCH_VIEW_CACHE_TTL
+)
+
+
+async def get_match_players_view(
+    match_id: int, locale: TranslatorRunner
+) -> Optional[MatchPlayersView]:
+    """
+    Возвращает снимок матча из общего кэша (ключ — match_id и язык), при промахе
+    собирает его один раз для всех одновременных запросов. None, если игроков нет.
+    """
+    key = (match_id, get_locale_name(locale))
+    view = _match_views.get(key)
+    if view is not None:
+        return view
+
+    return await single_flight(
+        ("match_view",) + key, lambda: _build_match_players_view(key, locale)
+    )
+
+
+async def _build_match_players_view(
+    key: Tuple[int, str], locale: TranslatorRunner
+) -> Optional[MatchPlayersView]:
+    match_id = key[0]
+    players = [asdict(player) for player in await get_info_about_players_of_match(match_id, locale)]
+    if not players:
+        return None
+
+    # ранг публичного аккаунта не пришёл (таймаут или ошибка источника)
+    complete = all(
+        player["rank"] is not None or player["account_id"] is None for player in players
+    )
+    pages = []
+    for index in range(len(players)):
+        try:
+            pages.append(format_player_info_in_match(players, index, locale))
+        except Exception as e:
+            logging.error(
+                "Ошибка при форматировании игрока %s матча %s: %s", index, match_id, e, exc_info=True
+            )
+            pages.append(locale.unexpected_error())
+            complete = False
+
+    view = MatchPlayersView(match_id=match_id, pages=tuple(pages))
+    if complete:  # неполный снимок не кэшируем, следующий запрос соберёт его заново
+        _match_views[key] = view
+    return view
@@ -1,21 +1,51 @@
 """Bot middlewares"""
 
+import asyncio
 import logging
-from typing import Any, Awaitable, Callable, Dict
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 
 from fluentogram import TranslatorHub
 from aiogram import BaseMiddleware
-from aiogram.types import Update, Message
-from cachetools import TTLCache
+from aiogram.types import CallbackQuery, Update, Message
 
 from ..database.requests import check_language_user, set_user
+from ..parsers.deadline import reset_deadline, start_deadline
+from .config import settings
+from .throttling import MemoryThrottleBackend, ThrottleBackend
 
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
-caches = {"default": TTLCache(maxsize=10_000, ttl=0.1)}
+# пагинация: из нескольких быстрых нажатий важно только последнее
+MERGEABLE_CALLBACK_PREFIXES = ("page:", "carousel:", "start_page:")
+
+# throttled — отброшено, queued — обработано после ожидания, merged — заменено более новым
+throttling_stats: Counter = Counter()
+
+
+class DeadlineMiddleware(BaseMiddleware):
+    """
+    Запускает дедлайн в момент получения апдейта: все запросы к внешним API,
+    сделанные при его обработке, получают только оставшееся время
+    """
+
+    def __init__(self, budget: float = settings.UPDATE_DEADLINE) -> None:
+        self.budget = budget
+
+    async def __call__(
+        self,
+        handler: Callable[[Update, Dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: Dict[str, Any],
+    ) -> Any:
+        token = start_deadline(self.budget)
+        try:
+            return await handler(event, data)
+        finally:
+            reset_deadline(token)
 
 
 class UserMiddleware(BaseMiddleware):
@@ -29,7 +59,10 @@ class UserMiddleware(BaseMiddleware):
         event: Message,
         data: Dict[str, Any],
     ) -> Any:
-        await set_user(tg_id=event.from_user.id, name=event.from_user.username)
+        await set_user(
+            tg_id=event.from_user.id,
+            name=event.from_user.username or event.from_user.full_name,
+        )
 
         return await handler(event, data)
 
@@ -56,10 +89,34 @@ class TranslateMiddleware(BaseMiddleware):
 
 
 class ThrottlingMiddleware(BaseMiddleware):
-    """Throttling middleware"""
+    """
+    Throttling middleware: token bucket на пользователя. Апдейт сверх лимита ждёт
+    токен до THROTTLE_MAX_WAIT, а ожидающее нажатие пагинации заменяется более новым.
+    """
 
-    def __init__(self, time_limit: int = 1) -> None: 
-        self.limit = TTLCache(maxsize=10_000, ttl=time_limit)
+    def __init__(self, backend: Optional[ThrottleBackend] = None) -> None:
+        self.backend = backend or MemoryThrottleBackend(
+            settings.THROTTLE_RATE, settings.THROTTLE_BURST, settings.THROTTLE_MAX_WAIT
+        )
+        # (пользователь, тип пагинации) -> (id последнего нажатия, когда его обработать)
+        self._pending: Dict[Tuple[int, str], Tuple[str, float]] = {}
+
+    @staticmethod
+    def _merge_key(event: Any) -> Optional[Tuple[int, str]]:
+        if not isinstance(event, CallbackQuery) or not event.data:
+            return None
+        for prefix in MERGEABLE_CALLBACK_PREFIXES:
+            if event.data.startswith(prefix):
+                return event.from_user.id, prefix
+        return None
+
+    @staticmethod
+    async def _skip(event: Any) -> None:
+        if isinstance(event, CallbackQuery):  # убираем «часики» на кнопке
+            try:
+                await event.answer()
+            except Exception as e:
+                logging.debug("Не удалось ответить на пропущенный callback: %s", e)
 
     async def __call__(
         self,
@@ -72,9 +129,42 @@ class ThrottlingMiddleware(BaseMiddleware):
         if not hasattr(event, "from_user") or event.from_user is None:
             return await handler(event, data)
 
-        if event.from_user.id in self.limit:
-            logging.info("Троттлинг активен для пользователя: %s", event.from_user.id)
-            return
+        loop = asyncio.get_running_loop()
+        merge_key = self._merge_key(event)
+        pending = self._pending.get(merge_key) if merge_key else None
+        is_pending = pending is not None
+
+        if is_pending:
+            # токен уже занят предыдущим нажатием — новое нажатие займёт его место
+            wait = pending[1] - loop.time()
+            self._pending[merge_key] = (event.id, pending[1])
         else:
-            self.limit[event.from_user.id] = None
+            try:
+                wait = await self.backend.acquire(event.from_user.id)
+            except Exception as e:  # лимитер недоступен — не блокируем пользователей
+                logging.error("Ошибка бэкенда троттлинга: %s", e, exc_info=True)
+                wait = 0
+
+            if wait is None:
+                throttling_stats["throttled"] += 1
+                logging.info("Троттлинг активен для пользователя: %s", event.from_user.id)
+                await self._skip(event)
+                return
+            if wait > 0:
+                throttling_stats["queued"] += 1
+                if merge_key:
+                    self._pending[merge_key] = (event.id, loop.time() + wait)
+                    is_pending = True
+
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        if is_pending:
+            latest = self._pending.get(merge_key)
+            if latest is None or latest[0] != event.id:
+                throttling_stats["merged"] += 1
+                await self._skip(event)
+                return
+            del self._pending[merge_key]
+
         return await handler(event, data)
@@ -0,0 +1,67 @@
+"""Priority token bucket shared by the OpenDota client and broadcasts"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from enum import IntEnum
+from typing import List, Optional, Tuple
+
+
+class Priority(IntEnum):
+    """Чем меньше значение, тем раньше запрос получит токен."""
+
+    INTERACTIVE = 0  # запросы пользователей из хендлеров
+    BACKGROUND = 1  # фоновые задачи (обновление каталогов и т.п.)
+
+
+class RequestScheduler:
+    """Token bucket с очередью по приоритетам (запросы к OpenDota, рассылки)."""
+
+    def __init__(self, rate_per_minute: int, burst: int) -> None:
+        self.rate = rate_per_minute / 60
+        self.capacity = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    @property
+    def queue_depth(self) -> int:
+        """Количество запросов, ожидающих токен."""
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, priority: Priority = Priority.INTERACTIVE) -> None:
+        """Ждёт, пока для запроса освободится токен."""
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        logging.debug("Очередь: %s запросов ждут токен", self.queue_depth)
+
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        await future
+
+    async def _dispatch(self) -> None:
+        while self._waiters:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                continue
+
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():  # ожидающий запрос уже отменён
+                continue
+            self._tokens -= 1
+            future.set_result(None)
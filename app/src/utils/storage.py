@@ -0,0 +1,57 @@
+"""FSM storage and shared Redis connection"""
+
+import json
+import logging
+from functools import partial
+from typing import Optional
+
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.fsm.storage.redis import RedisStorage
+from redis.asyncio import Redis
+
+from .config import settings
+
+_redis: Optional[Redis] = None
+
+# без пробелов и \u-экранирования: данные FSM занимают меньше места в Redis
+_compact_json_dumps = partial(json.dumps, separators=(",", ":"), ensure_ascii=False)
+
+
+def get_redis() -> Optional[Redis]:
+    """Возвращает общее подключение к Redis или None, если REDIS_URL не задан."""
+    global _redis
+
+    if not settings.REDIS_URL:
+        return None
+    if _redis is None:
+        _redis = Redis.from_url(settings.REDIS_URL)
+    return _redis
+
+
+async def close_redis() -> None:
+    global _redis
+
+    if _redis is not None:
+        await _redis.aclose(close_connection_pool=True)
+        logging.info("Подключение к Redis закрыто")
+    _redis = None
+
+
+def create_fsm_storage(redis: Optional[Redis] = None) -> BaseStorage:
+    """
+    Хранилище FSM: Redis, если он настроен (состояния переживают перезапуск и общие
+    для всех инстансов бота), иначе память процесса — для локальной разработки.
+    """
+    redis = redis or get_redis()
+    if redis is None:
+        logging.info("REDIS_URL не задан, состояния FSM хранятся в памяти процесса")
+        return MemoryStorage()
+
+    return RedisStorage(
+        redis,
+        key_builder=DefaultKeyBuilder(prefix=settings.REDIS_FSM_PREFIX),
+        state_ttl=settings.FSM_STATE_TTL,
+        data_ttl=settings.FSM_DATA_TTL,
+        json_dumps=_compact_json_dumps,
+    )
@@ -0,0 +1,107 @@
+"""Per-user rate limit backends for ThrottlingMiddleware"""
+
+import math
+import time
+from abc import ABC, abstractmethod
+from typing import Hashable, Optional, Tuple
+
+from cachetools import TTLCache
+from redis.asyncio import Redis
+from redis.exceptions import WatchError
+
+from .config import settings
+from .storage import get_redis
+
+
+class ThrottleBackend(ABC):
+    """
+    Лимит rate апдейтов в секунду с запасом burst (GCRA — эквивалент token bucket):
+    для ключа хранится только «теоретическое время прибытия» следующего апдейта.
+    Если токена нет, апдейт может занять токен в будущем, но не дальше max_wait.
+    """
+
+    def __init__(self, rate: float, burst: int, max_wait: float = 0) -> None:
+        self.interval = 1 / rate
+        self.tolerance = self.interval * (burst - 1)
+        self.max_wait = max_wait
+
+    def _gcra(self, now: float, tat: Optional[float]) -> Tuple[Optional[float], float]:
+        """Возвращает (сколько ждать или None — апдейт отклонён, новое значение TAT)."""
+        tat = max(tat or now, now)
+        wait = tat - self.tolerance - now
+        if wait > self.max_wait:
+            return None, tat
+        return max(wait, 0.0), tat + self.interval
+
+    @abstractmethod
+    async def acquire(self, key: Hashable) -> Optional[float]:
+        """
+        Занимает токен для апдейта. Возвращает, сколько секунд подождать перед
+        обработкой (0 — сразу), или None, если лимит превышен.
+        """
+
+
+class MemoryThrottleBackend(ThrottleBackend):
+    """Лимит в памяти процесса: у каждого инстанса бота свой счётчик."""
+
+    def __init__(
+        self, rate: float, burst: int, max_wait: float = 0, maxsize: int = 10_000
+    ) -> None:
+        super().__init__(rate, burst, max_wait)
+        # когда TAT в прошлом, ведро пользователя снова полное и запись не нужна
+        self._tat = TTLCache(maxsize=maxsize, ttl=self.interval * burst + max_wait)
+
+    async def acquire(self, key: Hashable) -> Optional[float]:
+        wait, tat = self._gcra(time.monotonic(), self._tat.get(key))
+        if wait is not None:
+            self._tat[key] = tat
+        return wait
+
+
+class RedisThrottleBackend(ThrottleBackend):
+    """Общий для всех инстансов лимит в Redis (WATCH/MULTI, время берётся у Redis)."""
+
+    def __init__(
+        self, redis: Redis, rate: float, burst: int, max_wait: float, prefix: str
+    ) -> None:
+        super().__init__(rate, burst, max_wait)
+        self.redis = redis
+        self.prefix = prefix
+
+    async def acquire(self, key: Hashable) -> Optional[float]:
+        redis_key = f"{self.prefix}:{key}"
+        async with self.redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(redis_key)
+                    seconds, microseconds = await pipe.time()
+                    now = seconds + microseconds / 1_000_000
+                    stored = await pipe.get(redis_key)
+
+                    wait, tat = self._gcra(now, float(stored) if stored else None)
+                    if wait is None:
+                        await pipe.unwatch()
+                        return None
+
+                    pipe.multi()
+                    pipe.set(redis_key, repr(tat), px=math.ceil((tat - now) * 1000))
+                    await pipe.execute()
+                    return wait
+                except WatchError:  # ключ изменил другой инстанс, пробуем ещё раз
+                    continue
+
+
+def create_throttle_backend(scope: str) -> ThrottleBackend:
+    """Redis-бэкенд, если настроен REDIS_URL, иначе лимит в памяти процесса."""
+    redis = get_redis()
+    if redis is None:
+        return MemoryThrottleBackend(
+            settings.THROTTLE_RATE, settings.THROTTLE_BURST, settings.THROTTLE_MAX_WAIT
+        )
+    return RedisThrottleBackend(
+        redis,
+        settings.THROTTLE_RATE,
+        settings.THROTTLE_BURST,
+        settings.THROTTLE_MAX_WAIT,
+        prefix=f"{settings.REDIS_THROTTLE_PREFIX}:{scope}",
+    )
@@ -0,0 +1,198 @@
+"""Ahead-of-time compiled Fluent bundles and a lazily loaded TranslatorHub
+
+Сборка артефактов (например, при сборке Docker-образа):
+    python -m app.src.utils.translations
+
+Без артефактов бот работает так же, но компилирует .ftl при первом обращении.
+Артефакты используют внутренности fluent-compiler, поэтому его версия
+закреплена в requirements.txt и входит в имя артефакта.
+"""
+
+import builtins
+import hashlib
+import logging
+import marshal
+import os
+import sys
+import time
+from functools import cached_property
+from importlib.metadata import version
+from pathlib import Path
+from typing import Dict, Tuple
+
+import babel
+import babel.plural
+from fluent_compiler import runtime
+from fluent_compiler.bundle import FluentBundle
+from fluent_compiler.compiler import (
+    BUILTINS,
+    LOCALE_NAME,
+    PLURAL_FORM_FOR_NUMBER_NAME,
+    compile_messages,
+)
+from fluent_compiler.resource import FtlResource
+from fluentogram import FluentTranslator, TranslatorHub, TranslatorRunner
+
+I18N_DIR = Path(__file__).resolve().parents[1] / "i18n"
+COMPILED_DIR = I18N_DIR / "compiled"
+
+# код языка бота -> (локаль для Fluent, файлы переводов)
+LOCALES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "ru": ("ru-RU", ("text.ftl", "button.ftl")),
+    "en": ("en-US", ("text.ftl", "button.ftl")),
+}
+
+
+def _ftl_paths(locale: str) -> Tuple[Path, ...]:
+    return tuple(I18N_DIR / locale / filename for filename in LOCALES[locale][1])
+
+
+def get_artifact_path(locale: str) -> Path:
+    """
+    Путь к скомпилированному бандлу. Имя зависит от содержимого .ftl файлов, версии
+    fluent-compiler и Python (байткод несовместим между версиями), поэтому при
+    любом изменении артефакт пересобирается.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{sys.version_info[:2]}:{version('fluent-compiler')}:{LOCALES[locale][0]}".encode())
+    for path in _ftl_paths(locale):
+        digest.update(path.read_bytes())
+    return COMPILED_DIR / f"{locale}-{digest.hexdigest()[:16]}.bin"
+
+
+def compile_locale(locale: str) -> Path:
+    """Компилирует .ftl файлы языка и сохраняет байткод бандла в COMPILED_DIR."""
+    fluent_locale = LOCALES[locale][0]
+    compiled = compile_messages(
+        fluent_locale, [FtlResource.from_file(str(path)) for path in _ftl_paths(locale)]
+    )
+    for error in compiled.errors:
+        logging.warning("Ошибка в переводах %s: %s", locale, error)
+
+    code = compile(compiled.module_ast, f"<fluent {locale}>", "exec")
+    mapping = {
+        message_id: function.__name__
+        for message_id, function in compiled.message_functions.items()
+    }
+
+    path = get_artifact_path(locale)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_bytes(marshal.dumps((code, mapping)))
+    os.replace(tmp_path, path)  # воркеры могут собирать артефакт одновременно
+    return path
+
+
+def _module_globals(fluent_locale: str) -> dict:
+    """Глобальные имена, которые fluent-compiler подставляет в скомпилированный модуль."""
+    locale = babel.Locale.parse(fluent_locale.replace("-", "_"))
+    plural_form = babel.plural.to_python(locale.plural_form)
+
+    def plural_form_for_number(number):
+        try:
+            return plural_form(number)
+        except TypeError:
+            return None
+
+    module_globals = {name: getattr(runtime, name) for name in runtime.__all__}
+    module_globals.update(builtins.__dict__)
+    module_globals.update(BUILTINS)
+    module_globals[LOCALE_NAME] = locale
+    module_globals[PLURAL_FORM_FOR_NUMBER_NAME] = plural_form_for_number
+    return module_globals
+
+
+class PrecompiledFluentBundle(FluentBundle):
+    """FluentBundle из готового байткода, без разбора и компиляции .ftl."""
+
+    def __init__(self, locale: str, message_functions: dict) -> None:
+        self.locale = locale
+        self._compiled_messages = message_functions
+        self._compilation_errors = []
+
+
+def _load_precompiled(locale: str, path: Path) -> FluentBundle:
+    fluent_locale = LOCALES[locale][0]
+    code, mapping = marshal.loads(path.read_bytes())
+    module_globals = _module_globals(fluent_locale)
+    exec(code, module_globals)
+    return PrecompiledFluentBundle(
+        fluent_locale,
+        {message_id: module_globals[name] for message_id, name in mapping.items()},
+    )
+
+
+def load_bundle(locale: str) -> FluentBundle:
+    """
+    Загружает бандл языка из артефакта. Если артефакта нет (не собран, изменились
+    .ftl или версия fluent-compiler) или он не загрузился, компилирует .ftl обычным
+    FluentBundle в памяти — в исходники во время работы ничего не пишется.
+    """
+    start = time.perf_counter()
+
+    path = get_artifact_path(locale)
+    bundle = None
+    if path.exists():
+        try:
+            bundle = _load_precompiled(locale, path)
+        except Exception as e:
+            logging.error("Не удалось загрузить артефакт переводов %s: %s", path, e, exc_info=True)
+
+    from_cache = bundle is not None
+    if not from_cache:
+        bundle = FluentBundle.from_files(
+            LOCALES[locale][0], filenames=[str(path) for path in _ftl_paths(locale)]
+        )
+
+    logging.info(
+        "Переводы %s загружены за %.1f мс (%s)",
+        locale,
+        (time.perf_counter() - start) * 1000,
+        "из артефакта" if from_cache else "из .ftl, артефакт не собран",
+    )
+    return bundle
+
+
+def verify_artifact(locale: str) -> None:
+    """Сверяет переводы из артефакта с обычным FluentBundle по всем сообщениям."""
+    expected = FluentBundle.from_files(
+        LOCALES[locale][0], filenames=[str(path) for path in _ftl_paths(locale)]
+    )
+    actual = _load_precompiled(locale, get_artifact_path(locale))
+    for message_id in expected._compiled_messages:
+        if actual.format(message_id)[0] != expected.format(message_id)[0]:
+            raise RuntimeError(f"Артефакт {locale} расходится с .ftl в сообщении {message_id!r}")
+
+
+class LazyFluentTranslator(FluentTranslator):
+    """Переводчик, загружающий бандл при первом обращении к переводу."""
+
+    def __init__(self, locale: str, separator: str = "-") -> None:
+        self.locale = locale
+        self.separator = separator
+
+    @cached_property
+    def translator(self) -> FluentBundle:
+        return load_bundle(self.locale)
+
+
+def get_locale_name(locale: TranslatorRunner) -> str:
+    """Возвращает код языка, для которого создан TranslatorRunner."""
+    return locale.translators[0].locale
+
+
+def create_translator_hub() -> TranslatorHub:
+    return TranslatorHub(
+        {"ru": ("ru",), "en": ("en", "ru")},
+        translators=[LazyFluentTranslator(locale) for locale in LOCALES],
+        root_locale="ru",
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    for locale in LOCALES:
+        start = time.perf_counter()
+        artifact = compile_locale(locale)
+        verify_artifact(locale)
+        print(f"{locale}: {artifact} ({(time.perf_counter() - start) * 1000:.1f} ms)")
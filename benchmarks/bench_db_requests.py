@@ -0,0 +1,56 @@
+"""Benchmark: hot-path database requests
+
+Run from the repository root (SQLite in a temporary file by default):
+    python -m benchmarks.bench_db_requests [number_of_users]
+
+To benchmark MySQL, set DB_DRIVER/DB_HOST/DB_USER/DB_PASSWORD/DB_NAME as for the bot.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("BOT_TOKEN", "0:benchmark")
+os.environ.setdefault("ADMINS", "0")
+os.environ.setdefault("DB_DRIVER", "sqlite+aiosqlite")
+os.environ.setdefault("DB_NAME", os.path.join(tempfile.mkdtemp(), "bench.db"))
+
+from app.src.database import requests  # noqa: E402
+from app.src.database.engine import engine, start_db  # noqa: E402
+
+
+async def bench(name: str, count: int, make_call) -> None:
+    start = time.perf_counter()
+    for i in range(count):
+        await make_call(i)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<28} {count / elapsed:>10.0f} ops/s  ({elapsed * 1000 / count:.3f} ms/op)")
+
+
+async def main(users: int) -> None:
+    print(f"{engine.url.render_as_string(hide_password=True)}, {users} users")
+    await start_db()
+
+    await bench("set_user (insert)", users, lambda i: requests.set_user(10_000 + i, f"user{i}"))
+    requests._user_cache.clear()
+    await bench("set_user (existing)", users, lambda i: requests.set_user(10_000 + i, f"user{i}"))
+    requests._user_cache.clear()
+    await bench("check_language_user (db)", users, lambda i: requests.check_language_user(10_000 + i))
+    await bench("check_language_user (cache)", users, lambda i: requests.check_language_user(10_000 + i))
+
+    await bench("increment_user_request_count", users, lambda i: requests.increment_user_request_count(10_000 + i))
+    start = time.perf_counter()
+    await requests.flush_request_counts()
+    print(f"{'flush_request_counts':<28} {(time.perf_counter() - start) * 1000:>10.1f} ms for {users} users")
+
+    await bench("get_user_profile_snapshot", users, lambda i: requests.get_user_profile_snapshot(10_000 + i))
+    await bench("count_users", 100, lambda i: requests.count_users())
+    await bench("get_top_users", 100, lambda i: requests.get_top_users(5))
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000))
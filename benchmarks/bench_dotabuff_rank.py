@@ -0,0 +1,67 @@
+"""Benchmark: DotaBuff rank extraction (BeautifulSoup vs streaming extractor)
+
+Run from the repository root:
+    python -m benchmarks.bench_dotabuff_rank [page.html ...]
+
+Without arguments the saved pages from benchmarks/fixtures are used.
+"""
+
+import asyncio
+import sys
+import timeit
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from bs4 import BeautifulSoup
+
+from app.src.parsers.dotabuff import extract_rank_title
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+CHUNK_SIZE = 16 * 1024
+REPEAT = 50
+
+
+def rank_with_soup(page: bytes) -> Optional[str]:
+    """Прежняя реализация get_rank_account: полный DOM через html.parser."""
+    soup = BeautifulSoup(page.decode("utf-8"), "html.parser")
+    try:
+        return soup.find("div", class_="rank-tier-wrapper")["title"].split(":")[1].strip()
+    except TypeError:
+        return None
+
+
+async def iter_chunks(page: bytes) -> AsyncIterator[bytes]:
+    for start in range(0, len(page), CHUNK_SIZE):
+        yield page[start:start + CHUNK_SIZE]
+
+
+def rank_with_stream(page: bytes) -> Optional[str]:
+    return asyncio.run(extract_rank_title(iter_chunks(page)))
+
+
+def bench(path: Path) -> None:
+    page = path.read_bytes()
+
+    soup_result = rank_with_soup(page)
+    stream_result = rank_with_stream(page)
+    assert soup_result == stream_result, (soup_result, stream_result)
+
+    soup_time = min(timeit.repeat(lambda: rank_with_soup(page), number=REPEAT, repeat=3)) / REPEAT
+    stream_time = min(timeit.repeat(lambda: rank_with_stream(page), number=REPEAT, repeat=3)) / REPEAT
+
+    print(
+        f"{path.name} ({len(page) // 1024} KiB, rank={stream_result!r}): "
+        f"BeautifulSoup {soup_time * 1000:.2f} ms, "
+        f"stream {stream_time * 1000:.2f} ms, "
+        f"x{soup_time / stream_time:.1f}"
+    )
+
+
+def main() -> None:
+    paths = [Path(arg) for arg in sys.argv[1:]] or sorted(FIXTURES_DIR.glob("dotabuff_*.html"))
+    for path in paths:
+        bench(path)
+
+
+if __name__ == "__main__":
+    main()
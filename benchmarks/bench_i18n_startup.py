@@ -0,0 +1,64 @@
+"""Benchmark: cold start of the translator hub
+
+Each variant runs in a fresh interpreter, so imports of the Fluent modules are
+included. fluentogram (and aiohttp it pulls in) is imported before the timer
+starts, as the bot imports it anyway:
+    python -m benchmarks.bench_i18n_startup [runs]
+"""
+
+import statistics
+import subprocess
+import sys
+
+FROM_FILES = """
+import time
+import fluentogram
+start = time.perf_counter()
+from fluent_compiler.bundle import FluentBundle
+for locale, fluent_locale in (("ru", "ru-RU"), ("en", "en-US")):
+    FluentBundle.from_files(fluent_locale, filenames=[
+        f"app/src/i18n/{locale}/text.ftl", f"app/src/i18n/{locale}/button.ftl"
+    ])
+print(time.perf_counter() - start)
+"""
+
+PRECOMPILED = """
+import time
+import fluentogram
+start = time.perf_counter()
+from app.src.utils.translations import create_translator_hub
+hub = create_translator_hub()
+for translator in hub.translators:
+    translator.translator
+print(time.perf_counter() - start)
+"""
+
+PRECOMPILED_ONE_LOCALE = """
+import time
+import fluentogram
+start = time.perf_counter()
+from app.src.utils.translations import create_translator_hub
+hub = create_translator_hub()
+hub.get_translator_by_locale("ru").welcome(user="benchmark")
+print(time.perf_counter() - start)
+"""
+
+
+def measure(code: str, runs: int) -> float:
+    timings = [
+        float(subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout)
+        for _ in range(runs)
+    ]
+    return statistics.median(timings) * 1000
+
+
+def main(runs: int) -> None:
+    subprocess.run([sys.executable, "-m", "app.src.utils.translations"], check=True, capture_output=True)
+
+    print(f"{'FluentBundle.from_files (ru+en)':<36} {measure(FROM_FILES, runs):>8.1f} ms")
+    print(f"{'precompiled artifacts (ru+en)':<36} {measure(PRECOMPILED, runs):>8.1f} ms")
+    print(f"{'precompiled, lazy (ru only)':<36} {measure(PRECOMPILED_ONE_LOCALE, runs):>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)